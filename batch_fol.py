@@ -0,0 +1,98 @@
+"""This module evaluates batches of formulas of first-order logic against one interpretation.
+
+Formulas checked against the same interpretation often share ground terms such as g(b) in
+f(g(b), y) and ground atoms such as R(a, g(b)), and Interpretation.truth_value evaluates them
+again at each occurrence, and again for each value of the quantified variables. Here the
+formulas are compiled as in fol_compilation.py, except that ground terms and ground atoms are
+looked up in tables shared by the whole batch: each one is evaluated once, the first time it is
+needed. Terms and formulas are hash-consed, so equal ground terms of different formulas share
+an entry. For example,
+
+result = evaluate_batch(interpretation, formulas)
+result.values        # array of the truth values of formulas (1 for true, 0 for false)
+result.evaluations   # number of distinct ground terms and atoms evaluated
+result.saved         # number of evaluations of ground terms and atoms answered by the tables
+"""
+
+from array import array
+from collections import namedtuple
+
+from fol_compilation import CompiledFOL
+from fol_formula import Atom
+from fol_functions import variables_from_term
+from term import Fun
+
+
+BatchResult = namedtuple('BatchResult', ['values', 'evaluations', 'saved'])
+
+
+class BatchEvaluator:
+    """Evaluates formulas against interpretation with shared tables of ground terms and atoms."""
+
+    def __init__(self, interpretation):
+        self.interpretation = interpretation
+        self.terms = {}
+        self.atoms = {}
+        self.evaluations = 0
+        self.saved = 0
+        self._ground = {}
+
+    def is_ground(self, term):
+        if term not in self._ground:
+            self._ground[term] = not variables_from_term(term)
+        return self._ground[term]
+
+    def term(self, term):
+        """Returns the interpretation of a ground term. Its ground subterms are looked up in
+        the table too, so a subterm shared by several terms is evaluated once."""
+        if term in self.terms:
+            self.saved += 1
+        else:
+            self.evaluations += 1
+            if isinstance(term, Fun):
+                args = tuple(self.term(arg) for arg in term.args)
+                self.terms[term] = self.interpretation.functions[term.name][args]
+            else:
+                self.terms[term] = self.interpretation.interpretation_term(term)
+        return self.terms[term]
+
+    def atom(self, atom):
+        """Returns the truth value of a ground atom."""
+        if atom in self.atoms:
+            self.saved += 1
+        else:
+            self.evaluations += 1
+            args = tuple(self.term(arg) for arg in atom.args)
+            self.atoms[atom] = args in self.interpretation.predicates[atom.name]
+        return self.atoms[atom]
+
+    def truth_value(self, formula):
+        """Returns the truth value of formula in the interpretation."""
+        return _BatchCompiledFOL(formula, self)(self.interpretation)
+
+
+class _BatchCompiledFOL(CompiledFOL):
+    """A CompiledFOL whose ground terms and atoms are looked up in the tables of a BatchEvaluator."""
+
+    def __init__(self, formula, evaluator):
+        self.evaluator = evaluator
+        super().__init__(formula)
+
+    def _term(self, term, scope):
+        if self.evaluator.is_ground(term):
+            lookup = self.evaluator.term
+            return lambda interpretation, environment: lookup(term)
+        return super()._term(term, scope)
+
+    def _formula(self, formula, scope):
+        if isinstance(formula, Atom) and all(self.evaluator.is_ground(arg) for arg in formula.args):
+            lookup = self.evaluator.atom
+            return lambda interpretation, environment: lookup(formula)
+        return super()._formula(formula, scope)
+
+
+def evaluate_batch(interpretation, formulas):
+    """Returns a BatchResult with the truth values of formulas in interpretation."""
+    evaluator = BatchEvaluator(interpretation)
+    values = array('B', (evaluator.truth_value(formula) for formula in formulas))
+    return BatchResult(values, evaluator.evaluations, evaluator.saved)
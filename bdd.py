@@ -0,0 +1,193 @@
+"""This module represents formulas in propositional logic as reduced ordered binary decision diagrams (BDDs).
+
+A BDD is a DAG in which each internal node tests an atom and has two children: low (the atom is
+false) and high (the atom is true). The leaves are the constants FALSE and TRUE. The atoms are
+tested in a fixed order on every path and no two nodes are equal, so each formula has exactly one
+BDD for a given order. In particular,
+
+bdd = BDD()
+bdd.build(Implies(Atom('p'), Atom('q'))) == bdd.build(Or(Not(Atom('p')), Atom('q')))   # True
+
+checks logical equivalence by comparing two node numbers, a formula is valid if and only if its
+BDD is TRUE, and the models of a BDD are counted in time linear in its size.
+
+The size of a BDD depends heavily on the order of the atoms. By default, atoms are ordered by
+their first occurrence in the formulas given to build, which keeps atoms that occur close
+together close in the order.
+"""
+
+import sys
+
+from formula import Atom, And, AndN, Iff, Implies, Not, Or, OrN, Xor
+from functions import children, postorder
+
+
+FALSE = 0
+TRUE = 1
+
+# level of the constants, below the levels of all atoms
+TERMINAL = sys.maxsize
+
+
+class BDD:
+    """A manager of BDD nodes sharing a unique table, a computed table and an order of atoms.
+
+    Nodes are integers: FALSE (0), TRUE (1) and the indexes of internal nodes, whose level
+    (the position of their atom in order), low and high children are stored in lists.
+    """
+
+    def __init__(self, order=()):
+        self.order = []  # level -> atom name
+        self.levels = {}  # atom name -> level
+        self.level = [TERMINAL, TERMINAL]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self.unique = {}  # (level, low, high) -> node
+        self.computed = {}  # (f, g, h) -> ite(f, g, h)
+        for name in order:
+            self.add_atom(name)
+
+    def __len__(self):
+        """Returns the number of nodes, including FALSE and TRUE."""
+        return len(self.level)
+
+    def add_atom(self, name):
+        """Places the atom name at the end of the order (if it is not already in it) and returns its level."""
+        level = self.levels.get(name)
+        if level is None:
+            level = self.levels[name] = len(self.order)
+            self.order.append(name)
+        return level
+
+    def node(self, level, low, high):
+        """Returns the node testing the atom at level with the given children."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = self.unique[key] = len(self.level)
+            self.level.append(level)
+            self.low.append(low)
+            self.high.append(high)
+        return node
+
+    def atom(self, name):
+        """Returns the BDD of the atom name."""
+        return self.node(self.add_atom(name), FALSE, TRUE)
+
+    def ite(self, f, g, h):
+        """Returns the BDD of (f ∧ g) ∨ (¬f ∧ h), that is, if f then g else h."""
+        level, low, high, computed = self.level, self.low, self.high, self.computed
+        values = []
+        # a task (f, g, h) leaves ite(f, g, h) in values, and a task (key, level) builds the node
+        # for key from the values left by its two cofactors
+        tasks = [(f, g, h)]
+        while tasks:
+            task = tasks.pop()
+            if len(task) == 2:
+                key, top = task
+                result_high = values.pop()
+                result = computed[key] = self.node(top, values.pop(), result_high)
+                values.append(result)
+                continue
+            f, g, h = task
+            if f == TRUE or g == h:
+                values.append(g)
+            elif f == FALSE:
+                values.append(h)
+            elif g == TRUE and h == FALSE:
+                values.append(f)
+            elif task in computed:
+                values.append(computed[task])
+            else:
+                top = min(level[f], level[g], level[h])
+                f0, f1 = (low[f], high[f]) if level[f] == top else (f, f)
+                g0, g1 = (low[g], high[g]) if level[g] == top else (g, g)
+                h0, h1 = (low[h], high[h]) if level[h] == top else (h, h)
+                tasks.append((task, top))
+                tasks.append((f1, g1, h1))
+                tasks.append((f0, g0, h0))
+        return values.pop()
+
+    def negate(self, f):
+        """Returns the BDD of ¬f."""
+        return self.ite(f, FALSE, TRUE)
+
+    def build(self, formula):
+        """Returns the BDD of formula."""
+        nodes = {}
+        for subformula in postorder(formula):
+            if isinstance(subformula, Atom):
+                nodes[subformula] = self.atom(subformula.name)
+                continue
+            inputs = [nodes[child] for child in children(subformula)]
+            if isinstance(subformula, Not):
+                result = self.negate(inputs[0])
+            elif isinstance(subformula, And):
+                result = self.ite(inputs[0], inputs[1], FALSE)
+            elif isinstance(subformula, Or):
+                result = self.ite(inputs[0], TRUE, inputs[1])
+            elif isinstance(subformula, Implies):
+                result = self.ite(inputs[0], inputs[1], TRUE)
+            elif isinstance(subformula, Iff):
+                result = self.ite(inputs[0], inputs[1], self.negate(inputs[1]))
+            elif isinstance(subformula, Xor):
+                result = self.ite(inputs[0], self.negate(inputs[1]), inputs[1])
+            elif isinstance(subformula, AndN):
+                result = TRUE
+                for node in inputs:
+                    result = self.ite(result, node, FALSE)
+            elif isinstance(subformula, OrN):
+                result = FALSE
+                for node in inputs:
+                    result = self.ite(result, TRUE, node)
+            else:
+                raise TypeError(f"{type(subformula).__name__} is not a connective of propositional logic.")
+            nodes[subformula] = result
+        return nodes[formula]
+
+    def reachable(self, f):
+        """Returns the sorted list of internal nodes reachable from f (children come before parents)."""
+        seen = set()
+        stack = [f]
+        while stack:
+            node = stack.pop()
+            if node > TRUE and node not in seen:
+                seen.add(node)
+                stack.append(self.low[node])
+                stack.append(self.high[node])
+        return sorted(seen)
+
+    def count(self, f):
+        """Returns the number of models of f over all atoms in the order."""
+        n = len(self.order)
+        level = self.level
+
+        def depth(node):
+            return min(level[node], n)
+
+        counts = {FALSE: 0, TRUE: 1}
+        # a node is always created after its children, so increasing numbers are a valid order
+        for node in self.reachable(f):
+            low, high = self.low[node], self.high[node]
+            counts[node] = (counts[low] << (depth(low) - level[node] - 1)) + \
+                           (counts[high] << (depth(high) - level[node] - 1))
+        return counts[f] << depth(f)
+
+    def model(self, f):
+        """Returns a model of f (a dictionary from all atoms in the order to truth values) or False if f is FALSE.
+
+        Atoms that are not tested on the chosen path of the BDD are true.
+        """
+        if f == FALSE:
+            return False
+        model = dict.fromkeys(self.order, True)
+        while f != TRUE:
+            name = self.order[self.level[f]]
+            if self.high[f] != FALSE:
+                f = self.high[f]
+            else:
+                model[name] = False
+                f = self.low[f]
+        return model
@@ -0,0 +1,58 @@
+"""Compares truth_value (the interpreter) with compile_formula on a full truth table.
+
+Run from the root of the project:
+
+python benchmarks/compile_benchmark.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from compilation import compile_formula
+from formula import *
+from semantics import interpretations, symbols_of, truth_value
+
+
+def random_formula(number_of_atoms, size, seed=0):
+    """Returns a random formula with the given number of connectives over atoms p0, p1, ..."""
+    rng = random.Random(seed)
+    pool = [Atom('p' + str(i)) for i in range(number_of_atoms)]
+    binary = [And, Or, Implies, Iff, Xor]
+    for i in range(size):
+        left = pool[i] if i < number_of_atoms else rng.choice(pool)
+        if rng.random() < 0.2:
+            pool.append(Not(left))
+        else:
+            pool.append(rng.choice(binary)(left, rng.choice(pool)))
+    formula = pool[-1]
+    for subformula in pool[-size // 4:-1]:
+        formula = Or(formula, subformula)
+    return formula
+
+
+def benchmark(number_of_atoms, size):
+    formula = random_formula(number_of_atoms, size)
+    symbols = symbols_of(formula)
+
+    start = time.perf_counter()
+    interpreted = [truth_value(formula, dict(zip(symbols, values))) for values in interpretations(symbols)]
+    interpreter_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    evaluate = compile_formula(formula, symbols).evaluate
+    compiled = [evaluate(*values) for values in interpretations(symbols)]
+    compiled_time = time.perf_counter() - start
+
+    assert interpreted == compiled
+    print(f'{number_of_atoms:>6} atoms {size:>6} connectives {2 ** len(symbols):>8} rows: '
+          f'interpreter {interpreter_time:8.3f}s  compiled {compiled_time:8.3f}s  '
+          f'speedup {interpreter_time / compiled_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    for number_of_atoms, size in [(8, 50), (12, 100), (14, 300), (16, 300)]:
+        benchmark(number_of_atoms, size)
@@ -0,0 +1,46 @@
+"""Measures the throughput of parsing.parse in tokens per second.
+
+Run from the root of the project:
+
+python benchmarks/parser_benchmark.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from functions import length
+from parsing import parse, tokenize
+
+
+def random_text(number_of_clauses, seed=0):
+    """Returns a CNF-like text with 3 literals per clause over atoms named as in examples/sudoku.py."""
+    rng = random.Random(seed)
+    clauses = []
+    for _ in range(number_of_clauses):
+        literals = []
+        for _ in range(3):
+            name = f'{rng.randint(1, 9)}_{rng.randint(1, 9)}_{rng.randint(1, 9)}'
+            literals.append(name if rng.random() < 0.5 else '¬' + name)
+        clauses.append('(' + ' ∨ '.join(literals) + ')')
+    return ' ∧ '.join(clauses)
+
+
+def benchmark(label, text):
+    number_of_tokens = sum(1 for _ in tokenize(text))
+    start = time.perf_counter()
+    formula = parse(text)
+    elapsed = time.perf_counter() - start
+    print(f'{label:>28}: {number_of_tokens:>9} tokens in {elapsed:7.3f}s '
+          f'({number_of_tokens / elapsed:12,.0f} tokens/s), length {length(formula)}')
+
+
+if __name__ == '__main__':
+    for number_of_clauses in [1000, 10000, 100000]:
+        benchmark(f'{number_of_clauses} clauses', random_text(number_of_clauses))
+    depth = 100000
+    benchmark(f'{depth} nested negations', '¬(' * depth + 'p' + ')' * depth)
+    benchmark(f'{depth}-long implication chain', ' → '.join(f'p{i}' for i in range(depth)))
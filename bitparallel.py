@@ -0,0 +1,137 @@
+"""This module evaluates a formula on many interpretations at once using bitwise operations.
+
+Each atom is represented by a Python integer whose bit r is the truth value of the atom in the
+r-th interpretation of a truth table. Evaluating the formula with &, |, ^ and ~ on these integers
+computes a whole column of the truth table at once. For example, with symbols ['p', 'q'],
+
+p = 0b0011 (rows 0 and 1)
+q = 0b0101 (rows 0 and 2)
+And(p, q) = p & q = 0b0001
+
+so the conjunction is only true in row 0, where p and q are both true.
+
+Truth tables with more than 2**BLOCK_BITS rows are split into blocks: the first atoms of
+symbols are fixed to constant values in each block (-1 for true, 0 for false), and the last
+BLOCK_BITS atoms are evaluated in parallel inside the block.
+"""
+
+from itertools import product
+
+from formula import And, AndN, Iff, Implies, Not, Or, OrN, Xor
+from compilation import build_function, generate_source
+
+
+BLOCK_BITS = 20
+
+BITWISE_OPERATORS = {
+    Not: '~{0}',
+    And: '{0} & {1}',
+    Or: '{0} | {1}',
+    Implies: '~{0} | {1}',
+    Iff: '~({0} ^ {1})',
+    Xor: '{0} ^ {1}',
+    AndN: (' & ', '-1'),
+    OrN: (' | ', '0'),
+}
+
+_masks = {}
+
+
+def atom_masks(number_of_symbols):
+    """Returns the bit masks of number_of_symbols atoms over a table of 2**number_of_symbols rows.
+
+    Row 0 assigns true to all atoms and the first atom changes slowest, as in itertools.product.
+    """
+    if number_of_symbols not in _masks:
+        rows = 1 << number_of_symbols
+        masks = []
+        for i in range(number_of_symbols):
+            half = 1 << (number_of_symbols - 1 - i)
+            # the first period (half ones, then half zeros) is doubled until it fills the rows,
+            # in linear time (a division by the period would be quadratic in the number of rows)
+            mask, width = (1 << half) - 1, 2 * half
+            while width < rows:
+                mask |= mask << width
+                width *= 2
+            masks.append(mask)
+        _masks[number_of_symbols] = masks
+    return _masks[number_of_symbols]
+
+
+class BitParallelFormula:
+    """A formula compiled into bitwise operations over the truth table of symbols."""
+
+    def __init__(self, formula, symbols, block_bits=BLOCK_BITS):
+        self.formula = formula
+        self.symbols = list(symbols)
+        self.parallel_bits = min(block_bits, len(self.symbols))
+        self.fixed = len(self.symbols) - self.parallel_bits
+        self.full = (1 << (1 << self.parallel_bits)) - 1
+        source = generate_source(formula, self.symbols, BITWISE_OPERATORS, result='{0} & full')
+        self.evaluate = build_function(source, namespace={'full': self.full})
+
+    def blocks(self):
+        """Yields pairs (fixed_values, bits) for each block of the truth table, in order.
+
+        fixed_values are the truth values of the first atoms of symbols in the block, and bit r
+        of bits is the truth value of the formula in row r of the block.
+        """
+        for fixed_values in product((True, False), repeat=self.fixed):
+            yield fixed_values, self.block(fixed_values)
+
+    def block(self, fixed_values):
+        """Returns the bits of the block in which the first atoms of symbols have fixed_values."""
+        constants = [-1 if value else 0 for value in fixed_values]
+        return self.evaluate(*constants, *atom_masks(self.parallel_bits))
+
+    def first_model(self, fixed_values, bits):
+        """Returns the interpretation (as a dictionary) of the first true row of a block, given by
+        the values of its fixed atoms and its bits (which must not be 0)."""
+        row = (bits & -bits).bit_length() - 1
+        values = list(fixed_values)
+        values += [not ((row >> (self.parallel_bits - 1 - i)) & 1) for i in range(self.parallel_bits)]
+        return dict(zip(self.symbols, values))
+
+    def is_valid(self):
+        """Returns True if the formula is true in every row of the truth table."""
+        return all(bits == self.full for _, bits in self.blocks())
+
+    def model(self):
+        """Returns the first interpretation (as a dictionary) in which the formula is true, or False."""
+        for fixed_values, bits in self.blocks():
+            if bits:
+                return self.first_model(fixed_values, bits)
+        return False
+
+    def count(self):
+        """Returns the number of rows of the truth table in which the formula is true."""
+        return sum(bits.bit_count() for _, bits in self.blocks())
+
+
+class BitParallelCNF(BitParallelFormula):
+    """A set of clauses (a ClauseDB, see clausedb.py) evaluated with bitwise operations.
+
+    The truth table ranges over all variables of the clauses, so its symbols (and the keys
+    of the interpretation returned by model) are the variables 1, 2, 3, ...
+    """
+
+    def __init__(self, db, block_bits=BLOCK_BITS):
+        self.formula = db
+        self.symbols = list(range(1, db.number_of_variables + 1))
+        self.parallel_bits = min(block_bits, len(self.symbols))
+        self.fixed = len(self.symbols) - self.parallel_bits
+        self.full = full = (1 << (1 << self.parallel_bits)) - 1
+        clauses = [list(clause) for clause in db]
+
+        def evaluate(*values):
+            result = full
+            for clause in clauses:
+                bits = 0
+                for literal in clause:
+                    bits |= values[literal - 1] if literal > 0 else ~values[-literal - 1]
+                result &= bits
+                if not result:
+                    break
+            return result & full
+
+        self.evaluate = evaluate
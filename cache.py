@@ -0,0 +1,223 @@
+"""This module keeps the clauses of encoded problems in a cache directory on disk.
+
+Building the formula of a puzzle and converting it to clauses may take much longer than solving
+it. An EncodingCache stores the ClauseDB (see clausedb.py) built by a generator function for
+given parameters in a file named by a SHA-256 hash of the source files of the generator and
+of its helpers and of the parameters, so the next run with the same puzzle reads the clauses
+back instead of encoding them again. For example,
+
+cache = EncodingCache()
+db = cache.clause_db(sudoku_formula, grid)   # calls sudoku_formula(grid) only on a cache miss
+satisfiability(db)
+
+When the files in the directory take more than max_bytes, the least recently used ones are
+removed.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+from array import array
+
+from clausedb import ClauseDB, SymbolTable
+from cnf import to_clause_db
+
+
+MAGIC = b'LGCC'
+VERSION = 1
+SUFFIX = '.cnfcache'
+
+DEFAULT_DIRECTORY = os.environ.get('LOGICOMP_CACHE_DIR',
+                                   os.path.join(os.path.expanduser('~'), '.cache', 'logicomp'))
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _native(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _source_files(generator):
+    """Returns the pairs (module name, source file) of the module of generator and of the
+    functions, classes and modules named by the global names of its code."""
+    objects = [generator]
+    code = getattr(generator, '__code__', None)
+    if code is not None:
+        names = set(code.co_names)
+        constants = list(code.co_consts)
+        while constants:
+            constant = constants.pop()
+            if inspect.iscode(constant):
+                # nested functions and comprehensions
+                names.update(constant.co_names)
+                constants.extend(constant.co_consts)
+        namespace = getattr(generator, '__globals__', {})
+        objects += [namespace[name] for name in names if name in namespace]
+    files = set()
+    for obj in objects:
+        if inspect.isfunction(obj) or inspect.isclass(obj) or inspect.ismodule(obj):
+            try:
+                path = inspect.getsourcefile(obj)
+            except TypeError:
+                path = None
+            if path is not None:
+                module = obj.__name__ if inspect.ismodule(obj) else obj.__module__
+                files.add((module, path))
+    return files
+
+
+class EncodingCache:
+    """A directory of ClauseDB files indexed by the generator and the parameters that built them."""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, generator, *args, **kwargs):
+        """Returns the hash identifying the result of generator(*args, **kwargs).
+
+        The contents of the source files of the module of generator and of the functions,
+        classes and modules it refers to by global names are part of the key, so editing the
+        generator or its helpers invalidates its entries. The files are identified by their
+        module names, not by their paths or modification times, so entries survive moving the
+        project or checking it out again. The parameters are identified by their repr.
+        """
+        sources = []
+        for module, path in sorted(_source_files(generator)):
+            try:
+                with open(path, 'rb') as file:
+                    sources.append((module, hashlib.sha256(file.read()).hexdigest()))
+            except OSError:
+                sources.append((module, None))
+        description = repr((VERSION, generator.__module__, generator.__qualname__, sources,
+                            args, sorted(kwargs.items())))
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        """Returns the ClauseDB stored under key, or None if there is none."""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            db = self._decode(data)
+        except (ValueError, TypeError):
+            # a corrupt entry (ValueError includes the errors of the utf-8 and JSON decoders)
+            db = None
+        if db is None:
+            self.misses += 1
+            return None
+        # the modification time marks the last use of an entry for the eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # evicted by another process since it was read
+            self.misses += 1
+            return None
+        self.hits += 1
+        return db
+
+    def put(self, key, db):
+        """Stores db under key and evicts the least recently used entries if necessary."""
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(self._encode(db))
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.evict()
+
+    def clause_db(self, generator, *args, **kwargs):
+        """Returns the ClauseDB of generator(*args, **kwargs), reading it from the cache if possible.
+
+        generator returns a formula (converted with the Tseitin transformation) or a ClauseDB.
+        """
+        key = self.key(generator, *args, **kwargs)
+        db = self.get(key)
+        if db is None:
+            problem = generator(*args, **kwargs)
+            db = problem if isinstance(problem, ClauseDB) else to_clause_db(problem)
+            self.put(key, db)
+        return db
+
+    def evict(self):
+        """Removes the least recently used entries until the cache takes at most max_bytes."""
+        entries = []
+        with os.scandir(self.directory) as scanned:
+            for entry in scanned:
+                if entry.name.endswith(SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Removes all entries."""
+        if os.path.isdir(self.directory):
+            with os.scandir(self.directory) as scanned:
+                for entry in scanned:
+                    if entry.name.endswith(SUFFIX):
+                        os.unlink(entry.path)
+
+    @staticmethod
+    def _encode(db):
+        # the names of the variables (None for auxiliary ones) are stored as JSON, so that both
+        # strings and numbers (see dimacs.load_dimacs) survive
+        names = json.dumps(db.symbols.names[1:]).encode('utf-8')
+        header = array('q', [VERSION, len(db.offsets), len(db.literals), len(names)])
+        return b''.join([MAGIC, _little_endian(header), _little_endian(db.offsets),
+                         _little_endian(db.literals), names])
+
+    @staticmethod
+    def _decode(data):
+        if data[:4] != MAGIC or len(data) < 36:
+            return None
+        version, number_of_offsets, number_of_literals, names_length = _native('q', data[4:36])
+        if version != VERSION:
+            return None
+        start = 36
+        middle = start + 8 * number_of_offsets
+        end = middle + 4 * number_of_literals
+        if len(data) != end + names_length:
+            return None
+        names = json.loads(data[end:].decode('utf-8'))
+        if not isinstance(names, list) or not all(name is None or isinstance(name, (str, int)) for name in names):
+            return None
+        symbols = SymbolTable()
+        symbols.names += names
+        symbols.variables = {name: variable for variable, name in enumerate(symbols.names) if name is not None}
+        db = ClauseDB(symbols)
+        db.offsets = _native('q', data[start:middle])
+        db.literals = _native('i', data[middle:end])
+        return db
@@ -0,0 +1,272 @@
+"""This module encodes cardinality constraints into clauses.
+
+A cardinality constraint says that at most, at least or exactly k of a list of literals are
+true. The naive encoding of "at most k" has one clause for each k + 1 literals, that is,
+binomial(n, k + 1) clauses. The encodings below introduce auxiliary variables and need far
+fewer clauses:
+
+- 'sequential': the sequential counter of Sinz (2005), with n * k auxiliary variables and
+  about 2 * n * k clauses (for "at least k", a second counter whose registers only imply
+  the counts);
+- 'totalizer': the totalizer of Bailleux and Boufkhad (2003), a tree of unary adders whose
+  outputs are cut at k + 1, with O(n * k) clauses;
+- 'network': the cardinality networks of Asín et al. (2011), built from odd-even merging
+  networks of comparators, with O(n * log(k)^2) clauses;
+- 'commander': the commander encoding of Frisch and Giannaros (2010), which splits the
+  literals into groups of 2 * (k + 1), counts each group with k commander variables
+  (pairwise for k = 1, with a sequential counter otherwise) and constrains the commanders
+  recursively, with O(n * k) clauses;
+- 'pairwise': the naive encoding, which is the smallest one when n and k are small.
+
+A bound larger than about n / 2 is encoded as a small bound on the negations of the literals
+(at least n - 2 of them are true if at most 2 of them are false), so the sizes above hold
+with min(k, n - k) in place of k.
+
+Clauses are written to a sink: a ClauseDB (see clausedb.py), a TseitinEncoder's db or a Solver
+(see solver.py), or any object with the methods new_var() and add_clause(clause). Literals are
+integers, as in cnf.py. For example, the following piece of code says that exactly two of the
+atoms p, q, r and s are true.
+
+db = ClauseDB()
+exactly_k(db, [db.variable(name) for name in 'pqrs'], 2, encoding='totalizer')
+"""
+
+from itertools import combinations
+
+
+ENCODINGS = ('sequential', 'totalizer', 'network', 'commander', 'pairwise')
+
+
+def at_most_k(sink, literals, k, encoding='sequential'):
+    """Adds clauses saying that at most k of literals are true."""
+    _cardinality(sink, literals, None, k, encoding)
+
+
+def at_least_k(sink, literals, k, encoding='sequential'):
+    """Adds clauses saying that at least k of literals are true."""
+    _cardinality(sink, literals, k, None, encoding)
+
+
+def exactly_k(sink, literals, k, encoding='sequential'):
+    """Adds clauses saying that exactly k of literals are true."""
+    _cardinality(sink, literals, k, k, encoding)
+
+
+def _cardinality(sink, literals, lower, upper, encoding):
+    """Adds clauses saying that between lower and upper (None for no bound) of literals are true."""
+    if encoding not in ENCODINGS:
+        raise ValueError(f"unknown cardinality encoding {encoding!r}, expected one of {', '.join(ENCODINGS)}.")
+    literals = list(literals)
+    n = len(literals)
+    if lower is not None and lower <= 0:
+        lower = None
+    if upper is not None and upper >= n:
+        upper = None
+    if (lower is not None and lower > n) or (upper is not None and upper < 0) or \
+            (lower is not None and upper is not None and lower > upper):
+        sink.add_clause([])
+        return
+    if upper == 0 or lower == n:
+        for literal in literals:
+            sink.add_clause([literal] if lower == n else [-literal])
+        return
+    # the encodings count up to the largest bound, so large bounds are turned into small ones:
+    # between lower and upper of the literals are true if between n - upper and n - lower of
+    # their negations are
+    flipped_lower = n - upper if upper is not None else None
+    flipped_upper = n - lower if lower is not None else None
+    if _cap(flipped_lower, flipped_upper) < _cap(lower, upper):
+        literals = [-literal for literal in literals]
+        lower, upper = flipped_lower, flipped_upper
+    if lower == 1:
+        sink.add_clause(literals)
+        lower = None
+    if lower is None and upper is None:
+        return
+    if encoding in ('totalizer', 'network'):
+        cap = upper + 1 if upper is not None else lower
+        build = _totalizer if encoding == 'totalizer' else _network
+        outputs = build(sink, literals, cap, upward=upper is not None, downward=lower is not None)
+        # outputs[i] is true if (totalizer: if and only if) at least i + 1 literals are true
+        if upper is not None and outputs[upper]:
+            sink.add_clause([-outputs[upper]])
+        if lower is not None:
+            sink.add_clause([outputs[lower - 1]] if outputs[lower - 1] else [])
+        return
+    at_most = {'sequential': _sequential, 'commander': _commander, 'pairwise': _pairwise}[encoding]
+    if upper is not None:
+        at_most(sink, literals, upper)
+    if lower is not None:
+        if encoding != 'pairwise' and lower <= n - lower:
+            _sequential_at_least(sink, literals, lower)
+        else:
+            # at least lower of the literals are true if at most n - lower of them are false
+            at_most(sink, [-literal for literal in literals], n - lower)
+
+
+def _cap(lower, upper):
+    """Returns the number of counts needed to check the bounds lower and upper."""
+    return max(lower or 0, upper + 1 if upper is not None else 0)
+
+
+def _pairwise(sink, literals, k):
+    for subset in combinations(literals, k + 1):
+        sink.add_clause([-literal for literal in subset])
+
+
+def _sequential(sink, literals, k):
+    n = len(literals)
+    add_clause = sink.add_clause
+    # registers[j] is true if at least j + 1 of the literals seen so far are true
+    registers = [sink.new_var() for _ in range(k)]
+    add_clause([-literals[0], registers[0]])
+    for j in range(1, k):
+        add_clause([-registers[j]])
+    for i in range(1, n - 1):
+        literal = literals[i]
+        previous = registers
+        registers = [sink.new_var() for _ in range(k)]
+        add_clause([-literal, registers[0]])
+        add_clause([-previous[0], registers[0]])
+        for j in range(1, k):
+            add_clause([-literal, -previous[j - 1], registers[j]])
+            add_clause([-previous[j], registers[j]])
+        add_clause([-literal, -previous[k - 1]])
+    add_clause([-literals[n - 1], -registers[k - 1]])
+
+
+def _sequential_at_least(sink, literals, k):
+    add_clause = sink.add_clause
+    # registers[j] is true only if at least j + 1 of the literals seen so far are true, and the
+    # register 0 stands for the constant false (more literals than seen so far)
+    registers = [literals[0]] + [0] * (k - 1)
+    for i in range(1, len(literals)):
+        literal = literals[i]
+        previous = registers
+        registers = []
+        for j in range(k):
+            if j > i:
+                registers.append(0)
+                continue
+            register = sink.new_var()
+            # j + 1 literals are true only if j + 1 were true before, or this one and j before
+            add_clause([-register, literal] + ([previous[j]] if previous[j] else []))
+            if j > 0:
+                add_clause([-register, previous[j - 1]] + ([previous[j]] if previous[j] else []))
+            registers.append(register)
+    add_clause([registers[k - 1]])
+
+
+def _commander(sink, literals, k):
+    # groups of 2 * (k + 1) literals get k commanders each, so each level halves the literals
+    size = 2 * (k + 1)
+    while len(literals) > size:
+        commanders = []
+        for start in range(0, len(literals), size):
+            group = literals[start:start + size]
+            if len(group) <= k:
+                # a group of at most k literals is its own set of commanders
+                commanders += group
+                continue
+            # the number of true literals of the group is at most the number of true commanders
+            group_commanders = [sink.new_var() for _ in range(k)]
+            _at_most_group(sink, group + [-commander for commander in group_commanders], k)
+            for j in range(k - 1):
+                sink.add_clause([-group_commanders[j + 1], group_commanders[j]])
+            commanders += group_commanders
+        literals = commanders
+    if len(literals) > k:
+        _at_most_group(sink, literals, k)
+
+
+def _at_most_group(sink, literals, k):
+    # pairwise has binomial(2k + 2, k + 1) clauses for the groups, which is small only for k = 1
+    if k == 1:
+        _pairwise(sink, literals, k)
+    else:
+        _sequential(sink, literals, k)
+
+
+def _totalizer(sink, literals, cap, upward, downward):
+    add_clause = sink.add_clause
+    nodes = [[literal] for literal in literals]
+    while len(nodes) > 1:
+        merged = []
+        for a, b in zip(nodes[0::2], nodes[1::2]):
+            outputs = [sink.new_var() for _ in range(min(len(a) + len(b), cap))]
+            for i in range(len(a) + 1):
+                for j in range(len(b) + 1):
+                    if upward and i + j > 0:
+                        clause = [outputs[min(i + j, len(outputs)) - 1]]
+                        if i:
+                            clause.append(-a[i - 1])
+                        if j:
+                            clause.append(-b[j - 1])
+                        add_clause(clause)
+                    if downward and i + j < len(outputs):
+                        clause = [-outputs[i + j]]
+                        if i < len(a):
+                            clause.append(a[i])
+                        if j < len(b):
+                            clause.append(b[j])
+                        add_clause(clause)
+            merged.append(outputs)
+        if len(nodes) % 2:
+            merged.append(nodes[-1])
+        nodes = merged
+    return nodes[0]
+
+
+def _network(sink, literals, cap, upward, downward):
+    # the literal 0 stands for the constant false, which is used to pad the inputs
+
+    def comparator(a, b):
+        if not a:
+            return b, 0
+        if not b:
+            return a, 0
+        high, low = sink.new_var(), sink.new_var()
+        if upward:
+            sink.add_clause([-a, high])
+            sink.add_clause([-b, high])
+            sink.add_clause([-a, -b, low])
+        if downward:
+            sink.add_clause([-high, a, b])
+            sink.add_clause([-low, a])
+            sink.add_clause([-low, b])
+        return high, low
+
+    def merge(a, b):
+        # merges two sorted (true first) lists of the same length, a power of 2
+        if len(a) == 1:
+            return list(comparator(a[0], b[0]))
+        odd, even = merge(a[0::2], b[0::2]), merge(a[1::2], b[1::2])
+        result = [odd[0]]
+        for i in range(len(a) - 1):
+            result += comparator(odd[i + 1], even[i])
+        return result + [even[-1]]
+
+    def simplified_merge(a, b):
+        # returns only the first len(a) + 1 outputs of merge(a, b)
+        if len(a) == 1:
+            return list(comparator(a[0], b[0]))
+        odd, even = simplified_merge(a[0::2], b[0::2]), simplified_merge(a[1::2], b[1::2])
+        result = [odd[0]]
+        for i in range(len(a) // 2):
+            result += comparator(odd[i + 1], even[i])
+        return result
+
+    def sort(a):
+        if len(a) == 1:
+            return a
+        half = len(a) // 2
+        return merge(sort(a[:half]), sort(a[half:]))
+
+    block = 1
+    while block < cap:
+        block *= 2
+    padded = literals + [0] * (-len(literals) % block)
+    outputs = sort(padded[:block])
+    for start in range(block, len(padded), block):
+        outputs = simplified_merge(outputs, sort(padded[start:start + block]))[:block]
+    return outputs[:cap]
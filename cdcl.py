@@ -0,0 +1,445 @@
+"""This module implements a conflict-driven clause-learning (CDCL) SAT solver.
+
+The solver works on clauses of integer literals, as in the DIMACS format: variables are the
+integers 1, 2, 3, ... and the literal -v is the negation of variable v. For example, the
+following piece of code checks the satisfiability of (x1 v x2) ∧ (¬x1 v x2) ∧ (¬x2 v x3).
+
+solver = CDCL()
+for clause in [[1, 2], [-1, 2], [-2, 3]]:
+    solver.add_clause(clause)
+solver.solve()   # True
+solver.model     # {1: False, 2: True, 3: True}
+
+It uses the standard ingredients of modern solvers: two watched literals for unit propagation,
+first-UIP conflict analysis with clause minimization, VSIDS branching with phase saving,
+Luby restarts and periodic deletion of inactive learned clauses.
+"""
+
+import heapq
+
+
+def luby(i):
+    """Returns the i-th element (starting at 0) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    size, exponent = 1, 0
+    while size < i + 1:
+        exponent += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        exponent -= 1
+        i = i % size
+    return 1 << exponent
+
+
+class CDCL:
+    """A CDCL SAT solver over clauses of integer literals."""
+
+    RESTART_UNIT = 100
+    VARIABLE_DECAY = 0.95
+    CLAUSE_DECAY = 0.999
+
+    def __init__(self):
+        self.number_of_variables = 0
+        self.clauses = []
+        self.learnts = []
+        self.model = None
+        self.ok = True
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        # arrays indexed by literal: index v is the literal v and index -v (counted from the
+        # end of the list) is the literal -v
+        self.value = [0]
+        self.watches = [[]]
+        # arrays indexed by variable
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.polarity = [False]
+        self.seen = [False]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.heap = []
+        self.variable_increment = 1.0
+        self.clause_increment = 1.0
+        self.clause_activity = {}
+        self.max_learnts = 0
+        self.assumptions = []
+
+    # -- variables and clauses
+
+    def new_var(self):
+        """Creates a new variable and returns it."""
+        self.ensure_variables(self.number_of_variables + 1)
+        return self.number_of_variables
+
+    def ensure_variables(self, number_of_variables):
+        """Makes sure that the variables 1, ..., number_of_variables exist."""
+        old = self.number_of_variables
+        if number_of_variables <= old:
+            return
+        self.number_of_variables = number_of_variables
+        grow = number_of_variables - old
+        # literal-indexed arrays keep the positive literals first and the negative ones last
+        self.value = self.value[:old + 1] + [0] * (2 * grow) + self.value[old + 1:]
+        self.watches = self.watches[:old + 1] + [[] for _ in range(2 * grow)] + self.watches[old + 1:]
+        self.level += [0] * grow
+        self.reason += [None] * grow
+        self.activity += [0.0] * grow
+        self.polarity += [False] * grow
+        self.seen += [False] * grow
+        for v in range(old + 1, number_of_variables + 1):
+            heapq.heappush(self.heap, (0.0, v))
+
+    def add_clause(self, clause):
+        """Adds a clause (an iterable of non-zero integers). Returns False if the clauses became unsatisfiable."""
+        if not self.ok:
+            return False
+        if self.trail_lim:
+            self._cancel_until(0)
+        literals = []
+        for literal in clause:
+            variable = abs(literal)
+            if variable > self.number_of_variables:
+                self.ensure_variables(variable)
+            value = self.value[literal]
+            if value == 1 or -literal in literals:
+                return True
+            if value == 0 and literal not in literals:
+                literals.append(literal)
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self._enqueue(literals[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(literals)
+            self.clauses.append(literals)
+        return self.ok
+
+    def _attach(self, clause):
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    # -- search
+
+    def solve(self, assumptions=()):
+        """Searches for a model of the clauses. Returns True if one exists and False otherwise.
+
+        If the clauses are satisfiable, the model is stored in the attribute model as a
+        dictionary from variables to truth values.
+
+        assumptions is a list of literals that must be true in the model. They hold only for
+        this call: the clauses learned while solving are consequences of the clauses alone,
+        so they are kept and speed up the next calls, with or without assumptions.
+        """
+        self.model = None
+        if not self.ok:
+            return False
+        if self.trail_lim:
+            self._cancel_until(0)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+        for literal in assumptions:
+            if abs(literal) > self.number_of_variables:
+                self.ensure_variables(abs(literal))
+        self.assumptions = list(assumptions)
+        self.max_learnts = max(len(self.clauses) // 3, len(self.learnts), 1000)
+        restarts = 0
+        while True:
+            status = self._search(luby(restarts) * self.RESTART_UNIT)
+            restarts += 1
+            if status is not None:
+                break
+            self.max_learnts = int(self.max_learnts * 1.05)
+        if status:
+            value = self.value
+            self.model = {v: value[v] == 1 for v in range(1, self.number_of_variables + 1)}
+        self._cancel_until(0)
+        self.assumptions = []
+        return status
+
+    def _search(self, conflict_limit):
+        """Runs CDCL until a model is found (True), the clauses are refuted under the
+        assumptions (False) or conflict_limit conflicts happen (None)."""
+        conflicts = 0
+        assumptions = self.assumptions
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, backtrack_level = self._analyze(conflict)
+                self._cancel_until(backtrack_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    self.learnts.append(learnt)
+                    self.clause_activity[id(learnt)] = self.clause_increment
+                    self._enqueue(learnt[0], learnt)
+                self.variable_increment /= self.VARIABLE_DECAY
+                self.clause_increment /= self.CLAUSE_DECAY
+            else:
+                if conflicts >= conflict_limit:
+                    self._cancel_until(0)
+                    return None
+                if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                    self._reduce_db()
+                literal = 0
+                while len(self.trail_lim) < len(assumptions):
+                    # each assumption is a decision of its own level
+                    assumption = assumptions[len(self.trail_lim)]
+                    if self.value[assumption] == 1:
+                        self.trail_lim.append(len(self.trail))
+                    elif self.value[assumption] == -1:
+                        return False
+                    else:
+                        literal = assumption
+                        break
+                if literal == 0:
+                    literal = self._pick_branch_literal()
+                    if literal == 0:
+                        return True
+                self.decisions += 1
+                self.trail_lim.append(len(self.trail))
+                self._enqueue(literal, None)
+
+    def _enqueue(self, literal, reason):
+        variable = abs(literal)
+        self.value[literal] = 1
+        self.value[-literal] = -1
+        self.level[variable] = len(self.trail_lim)
+        self.reason[variable] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """Propagates the enqueued literals. Returns a conflicting clause or None."""
+        trail = self.trail
+        value = self.value
+        watches = self.watches
+        level = self.level
+        reason = self.reason
+        decision_level = len(self.trail_lim)
+        conflict = None
+        while self.qhead < len(trail):
+            false_literal = -trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            watchers = watches[false_literal]
+            i = j = 0
+            end = len(watchers)
+            while i < end:
+                clause = watchers[i]
+                i += 1
+                first = clause[0]
+                if first == false_literal:
+                    first = clause[1]
+                    clause[0] = first
+                    clause[1] = false_literal
+                if value[first] == 1:
+                    watchers[j] = clause
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    if value[literal] != -1:
+                        clause[1] = literal
+                        clause[k] = false_literal
+                        watches[literal].append(clause)
+                        break
+                else:
+                    watchers[j] = clause
+                    j += 1
+                    if value[first] == -1:
+                        conflict = clause
+                        while i < end:
+                            watchers[j] = watchers[i]
+                            j += 1
+                            i += 1
+                    else:
+                        variable = abs(first)
+                        value[first] = 1
+                        value[-first] = -1
+                        level[variable] = decision_level
+                        reason[variable] = clause
+                        trail.append(first)
+            del watchers[j:]
+            if conflict is not None:
+                self.qhead = len(trail)
+                return conflict
+        return None
+
+    def _analyze(self, conflict):
+        """Derives the first-UIP learned clause of a conflict and the level to backtrack to."""
+        seen = self.seen
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        decision_level = len(self.trail_lim)
+        learnt = [0]
+        pending = 0
+        literal = 0
+        index = len(trail) - 1
+        clause = conflict
+        while True:
+            if id(clause) in self.clause_activity:
+                self._bump_clause(clause)
+            for q in (clause if literal == 0 else clause[1:]):
+                variable = abs(q)
+                if not seen[variable] and level[variable] > 0:
+                    seen[variable] = True
+                    self._bump_variable(variable)
+                    if level[variable] >= decision_level:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while not seen[abs(trail[index])]:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            clause = reason[abs(literal)]
+            seen[abs(literal)] = False
+            pending -= 1
+            if pending == 0:
+                break
+        learnt[0] = -literal
+
+        # clause minimization: drop the literals implied by the other literals of the clause,
+        # following their reasons back as far as needed (recursive minimization as in MiniSat)
+        abstract = 0
+        for q in learnt[1:]:
+            abstract |= 1 << (level[abs(q)] & 31)
+        cleared = [abs(q) for q in learnt[1:]]
+        minimized = [learnt[0]]
+        for q in learnt[1:]:
+            if reason[abs(q)] is None or not self._redundant(q, abstract, cleared):
+                minimized.append(q)
+        for variable in cleared:
+            seen[variable] = False
+
+        backtrack_level = 0
+        if len(minimized) > 1:
+            highest = 1
+            for i in range(2, len(minimized)):
+                if level[abs(minimized[i])] > level[abs(minimized[highest])]:
+                    highest = i
+            minimized[1], minimized[highest] = minimized[highest], minimized[1]
+            backtrack_level = level[abs(minimized[1])]
+        return minimized, backtrack_level
+
+    def _redundant(self, literal, abstract, cleared):
+        """Checks whether literal of a learned clause is implied by the other literals of the
+        clause (the variables marked as seen). abstract is the set of the levels of the clause,
+        as bits of an integer, so that literals assigned at other levels fail fast. Variables
+        found to be implied are marked as seen and appended to cleared."""
+        seen = self.seen
+        level = self.level
+        reason = self.reason
+        stack = [literal]
+        top = len(cleared)
+        while stack:
+            clause = reason[abs(stack.pop())]
+            for r in clause[1:]:
+                variable = abs(r)
+                if not seen[variable] and level[variable] > 0:
+                    if reason[variable] is not None and (1 << (level[variable] & 31)) & abstract:
+                        seen[variable] = True
+                        stack.append(r)
+                        cleared.append(variable)
+                    else:
+                        for variable in cleared[top:]:
+                            seen[variable] = False
+                        del cleared[top:]
+                        return False
+        return True
+
+    def _cancel_until(self, target_level):
+        if len(self.trail_lim) <= target_level:
+            return
+        trail = self.trail
+        value = self.value
+        reason = self.reason
+        polarity = self.polarity
+        activity = self.activity
+        heap = self.heap
+        start = self.trail_lim[target_level]
+        for i in range(len(trail) - 1, start - 1, -1):
+            literal = trail[i]
+            variable = abs(literal)
+            value[literal] = 0
+            value[-literal] = 0
+            reason[variable] = None
+            polarity[variable] = literal > 0
+            heapq.heappush(heap, (-activity[variable], variable))
+        del trail[start:]
+        del self.trail_lim[target_level:]
+        self.qhead = len(trail)
+
+    # -- heuristics
+
+    def _pick_branch_literal(self):
+        heap = self.heap
+        value = self.value
+        activity = self.activity
+        while heap:
+            priority, variable = heapq.heappop(heap)
+            if value[variable] == 0 and -priority == activity[variable]:
+                return variable if self.polarity[variable] else -variable
+        # stale entries may hide unassigned variables: rebuild the heap and look again
+        self.heap = [(-activity[v], v) for v in range(1, self.number_of_variables + 1) if value[v] == 0]
+        heapq.heapify(self.heap)
+        if self.heap:
+            variable = heapq.heappop(self.heap)[1]
+            return variable if self.polarity[variable] else -variable
+        return 0
+
+    def _bump_variable(self, variable):
+        activity = self.activity
+        activity[variable] += self.variable_increment
+        if activity[variable] > 1e100:
+            for v in range(1, self.number_of_variables + 1):
+                activity[v] *= 1e-100
+            self.variable_increment *= 1e-100
+            self.heap = [(-activity[v], v) for v in range(1, self.number_of_variables + 1) if self.value[v] == 0]
+            heapq.heapify(self.heap)
+        elif self.value[variable] == 0:
+            heapq.heappush(self.heap, (-activity[variable], variable))
+        if len(self.heap) > 8 * self.number_of_variables + 64:
+            self.heap = [(-activity[v], v) for v in range(1, self.number_of_variables + 1) if self.value[v] == 0]
+            heapq.heapify(self.heap)
+
+    def _bump_clause(self, clause):
+        activities = self.clause_activity
+        activities[id(clause)] += self.clause_increment
+        if activities[id(clause)] > 1e20:
+            for key in activities:
+                activities[key] *= 1e-20
+            self.clause_increment *= 1e-20
+
+    def _reduce_db(self):
+        """Deletes the less active half of the learned clauses that are not reasons of assignments."""
+        activities = self.clause_activity
+        reason = self.reason
+        self.learnts.sort(key=lambda clause: activities[id(clause)])
+        limit = self.clause_increment / max(len(self.learnts), 1)
+        half = len(self.learnts) // 2
+        kept = []
+        removed = set()
+        for i, clause in enumerate(self.learnts):
+            locked = reason[abs(clause[0])] is clause
+            if len(clause) > 2 and not locked and (i < half or activities[id(clause)] < limit):
+                removed.add(id(clause))
+                del activities[id(clause)]
+            else:
+                kept.append(clause)
+        self.learnts = kept
+        for literal in range(-self.number_of_variables, self.number_of_variables + 1):
+            watchers = self.watches[literal]
+            if watchers:
+                self.watches[literal] = [clause for clause in watchers if id(clause) not in removed]
@@ -0,0 +1,136 @@
+"""This module defines a compact storage for sets of clauses.
+
+A ClauseDB keeps all the literals of all its clauses in a single array of 32-bit integers, and
+the position where each clause starts in a second array. A clause with k literals costs about
+4 * k + 8 bytes, instead of a Python list of Python integers (or a tree of formula objects).
+
+Atom names are kept in a SymbolTable, which maps each name to a variable 1, 2, 3, ... and
+back. For example,
+
+db = ClauseDB()
+db.add_clause([db.variable('1_1_1'), -db.variable('1_1_2')])
+db.add_clause([db.variable('1_1_2')])
+len(db)                  # 2
+db[0]                    # array('i', [1, -2])
+db.symbols.name(2)       # '1_1_2'
+
+ClauseDB objects can be given to the functions of semantics.py in place of formulas.
+"""
+
+from array import array
+
+
+class SymbolTable:
+    """A bidirectional map between atom names and the variables 1, 2, 3, ...
+
+    Auxiliary variables (created with new_var) have no name.
+    """
+
+    def __init__(self, names=()):
+        self.names = [None]
+        self.variables = {}
+        for name in names:
+            self.variable(name)
+
+    def __len__(self):
+        """Returns the number of variables, named or not."""
+        return len(self.names) - 1
+
+    def __contains__(self, name):
+        return name in self.variables
+
+    def new_var(self):
+        """Creates a new auxiliary variable and returns it."""
+        self.names.append(None)
+        return len(self.names) - 1
+
+    def ensure_variables(self, number_of_variables):
+        """Makes sure that the variables 1, ..., number_of_variables exist."""
+        if number_of_variables >= len(self.names):
+            self.names += [None] * (number_of_variables + 1 - len(self.names))
+
+    def variable(self, name):
+        """Returns the variable of the atom with the given name, creating it if necessary."""
+        variable = self.variables.get(name)
+        if variable is None:
+            variable = self.variables[name] = self.new_var()
+            self.names[variable] = name
+        return variable
+
+    def set_name(self, variable, name):
+        """Gives a name to a variable (creating the variable if necessary)."""
+        self.ensure_variables(variable)
+        old = self.names[variable]
+        if old is not None:
+            del self.variables[old]
+        self.names[variable] = name
+        self.variables[name] = variable
+
+    def name(self, variable):
+        """Returns the name of the atom of a variable (None for auxiliary variables)."""
+        return self.names[variable]
+
+    def items(self):
+        """Returns the pairs (name, variable) of the named variables."""
+        return self.variables.items()
+
+
+class ClauseDB:
+    """A list of clauses of integer literals stored in flat arrays."""
+
+    def __init__(self, symbols=None):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.literals = array('i')
+        self.offsets = array('q', [0])
+
+    @property
+    def number_of_variables(self):
+        return len(self.symbols)
+
+    def new_var(self):
+        """Creates a new auxiliary variable and returns it."""
+        return self.symbols.new_var()
+
+    def variable(self, name):
+        """Returns the variable of the atom with the given name, creating it if necessary."""
+        return self.symbols.variable(name)
+
+    def add_clause(self, clause):
+        """Appends a clause (an iterable of non-zero integers)."""
+        literals = self.literals
+        start = len(literals)
+        literals.extend(clause)
+        if len(literals) > start:
+            self.symbols.ensure_variables(max(max(literals[start:]), -min(literals[start:])))
+        self.offsets.append(len(literals))
+
+    def extend(self, clauses):
+        """Appends all clauses of an iterable of clauses."""
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        """Returns the i-th clause as an array of literals."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('clause index out of range')
+        return self.literals[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        literals = self.literals
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield literals[offsets[i]:offsets[i + 1]]
+
+    def nbytes(self):
+        """Returns the number of bytes used by the arrays of clauses."""
+        return self.literals.itemsize * len(self.literals) + self.offsets.itemsize * len(self.offsets)
+
+    def model_names(self, model):
+        """Converts a model (a dictionary from variables to truth values) into an interpretation
+        over atom names, as returned by the functions of semantics.py."""
+        return {name: model.get(variable, False) for name, variable in self.symbols.items()}
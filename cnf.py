@@ -0,0 +1,151 @@
+"""This module converts formulas in propositional logic into conjunctive normal form (CNF).
+
+Distributing ∨ over ∧ may produce a CNF exponentially larger than the input formula. Instead,
+the Tseitin transformation introduces a new variable for each compound subformula and clauses
+stating that the variable is equivalent to the subformula. The result is equisatisfiable with
+the input and its size is linear in the size of the formula.
+
+Clauses are lists of integer literals, as in the DIMACS format: atoms and subformulas are
+numbered 1, 2, 3, ... and -v is the negation of v. For example,
+
+clauses, names = to_cnf_tseitin(And(Or(Atom('p'), Atom('q')), Not(Atom('p'))))
+
+returns clauses = [[1, 2], [-1]] and names = {1: 'p', 2: 'q'}. Top-level conjunctions and
+disjunctions of literals are written as clauses directly, without new variables.
+"""
+
+from formula import Atom, And, AndN, Iff, Implies, Not, Or, OrN, Xor
+from functions import postorder
+from clausedb import ClauseDB
+
+
+class TseitinEncoder:
+    """Encodes formulas into clauses stored in a ClauseDB (see clausedb.py).
+
+    Atoms with the same name always get the same variable, and structurally identical
+    subformulas (which are the same object, see hashcons.py) get the same auxiliary variable,
+    also across different calls of add.
+    """
+
+    def __init__(self, db=None):
+        self.db = db if db is not None else ClauseDB()
+        self.literals = {}  # subformula -> literal
+
+    def literal(self, formula):
+        """Returns a literal equivalent to formula, adding the clauses that define it."""
+        literals = self.literals
+        if formula in literals:
+            return literals[formula]
+        add_clause = self.db.add_clause
+        for node in postorder(formula):
+            if node in literals:
+                continue
+            if isinstance(node, Atom):
+                literals[node] = self.db.variable(node.name)
+                continue
+            if isinstance(node, Not):
+                literals[node] = -literals[node.inner]
+                continue
+            if isinstance(node, (AndN, OrN)):
+                # an n-ary disjunction is the negation of the conjunction of the negations
+                sign = 1 if isinstance(node, AndN) else -1
+                inputs = [sign * literals[inner] for inner in node.args]
+                x = self.db.new_var()
+                literals[node] = sign * x
+                for a in inputs:
+                    add_clause([-x, a])
+                add_clause([x] + [-a for a in inputs])
+                continue
+            a, b = literals[node.left], literals[node.right]
+            x = literals[node] = self.db.new_var()
+            if isinstance(node, And):
+                definition = [[-x, a], [-x, b], [x, -a, -b]]
+            elif isinstance(node, Or):
+                definition = [[x, -a], [x, -b], [-x, a, b]]
+            elif isinstance(node, Implies):
+                definition = [[x, a], [x, -b], [-x, -a, b]]
+            elif isinstance(node, Iff):
+                definition = [[-x, -a, b], [-x, a, -b], [x, a, b], [x, -a, -b]]
+            elif isinstance(node, Xor):
+                definition = [[-x, a, b], [-x, -a, -b], [x, -a, b], [x, a, -b]]
+            else:
+                raise TypeError(f"{type(node).__name__} is not a connective of propositional logic.")
+            for clause in definition:
+                add_clause(clause)
+        return literals[formula]
+
+    def add(self, formula):
+        """Adds clauses asserting formula."""
+        for conjunct in conjuncts(formula):
+            self.db.add_clause([self.literal(node) if positive else -self.literal(node)
+                                for node, positive in disjuncts(*conjunct)])
+
+
+def conjuncts(formula, positive=True):
+    """Splits formula (or its negation, if positive is False) into a list of conjuncts.
+
+    Each conjunct is a pair (subformula, polarity), where polarity False stands for the
+    negation of subformula. For example, the conjuncts of ¬(p ∨ (q → r)) are
+    (p, False), (q, True) and (r, False).
+    """
+    result = []
+    stack = [(formula, positive)]
+    while stack:
+        node, positive = stack.pop()
+        if isinstance(node, Not):
+            stack.append((node.inner, not positive))
+        elif isinstance(node, And if positive else Or):
+            stack.append((node.right, positive))
+            stack.append((node.left, positive))
+        elif isinstance(node, AndN if positive else OrN):
+            stack.extend((inner, positive) for inner in reversed(node.args))
+        elif not positive and isinstance(node, Implies):
+            stack.append((node.right, False))
+            stack.append((node.left, True))
+        else:
+            result.append((node, positive))
+    return result
+
+
+def disjuncts(formula, positive=True):
+    """Splits formula (or its negation, if positive is False) into a list of disjuncts.
+
+    Disjuncts are pairs (subformula, polarity) as in conjuncts. For example, the disjuncts
+    of (p → ¬(q ∧ r)) are (p, False), (q, False) and (r, False).
+    """
+    result = []
+    stack = [(formula, positive)]
+    while stack:
+        node, positive = stack.pop()
+        if isinstance(node, Not):
+            stack.append((node.inner, not positive))
+        elif isinstance(node, Or if positive else And):
+            stack.append((node.right, positive))
+            stack.append((node.left, positive))
+        elif isinstance(node, OrN if positive else AndN):
+            stack.extend((inner, positive) for inner in reversed(node.args))
+        elif positive and isinstance(node, Implies):
+            stack.append((node.right, True))
+            stack.append((node.left, False))
+        else:
+            result.append((node, positive))
+    return result
+
+
+def to_cnf_tseitin(formula):
+    """Returns an equisatisfiable CNF of formula as a pair (clauses, names).
+
+    clauses is a list of clauses of integer literals, and names maps the variables that
+    stand for atoms of formula to the names of these atoms. Every model of the clauses
+    restricted to these variables is a model of formula, and every model of formula extends
+    to exactly one model of the clauses.
+    """
+    db = to_clause_db(formula)
+    return [list(clause) for clause in db], {variable: name for name, variable in db.symbols.items()}
+
+
+def to_clause_db(formula, db=None):
+    """Adds the Tseitin CNF of formula to a ClauseDB (a new one by default) and returns it."""
+    encoder = TseitinEncoder(db)
+    encoder.add(formula)
+    return encoder.db
@@ -0,0 +1,102 @@
+"""This module compiles formulas in propositional logic into Python functions.
+
+truth_value (see semantics.py) walks the whole formula for every interpretation. When the same
+formula is evaluated many times, as in the truth-table methods, it is much faster to translate
+it once into straight-line Python code and then call the resulting function. For example,
+
+compiled = compile_formula(Implies(Atom('p'), Or(Atom('p'), Atom('s'))))
+compiled.symbols                     # ['p', 's']
+compiled.evaluate(True, False)       # True
+compiled({'p': False, 's': False})   # True
+
+The generated code has one assignment per distinct subformula, so shared subformulas are
+evaluated only once and the compilation itself does not recurse.
+"""
+
+from formula import Atom, And, AndN, Iff, Implies, Not, Or, OrN, Xor
+from functions import atoms, children, postorder
+
+
+BOOLEAN_OPERATORS = {
+    Not: 'not {0}',
+    And: '{0} and {1}',
+    Or: '{0} or {1}',
+    Implies: 'not {0} or {1}',
+    Iff: '{0} == {1}',
+    Xor: '{0} != {1}',
+    AndN: (' and ', 'True'),
+    OrN: (' or ', 'False'),
+}
+
+# n-ary connectives are evaluated in chunks, so that the generated expressions stay shallow
+CHUNK = 64
+
+
+def generate_source(formula, symbols, operators, name='evaluate', result='{0}'):
+    """Returns the source code of a Python function evaluating formula.
+
+    The function takes one positional argument for each atom name in symbols (in the same
+    order). operators maps each binary connective and negation to a format string combining
+    the values of the immediate subformulas, and each n-ary connective (AndN and OrN) to a pair
+    (separator, value of the empty connective). result is a format string applied to the value
+    of formula.
+    """
+    index = {symbol: i for i, symbol in enumerate(symbols)}
+    parameters = ['x' + str(i) for i in range(len(symbols))]
+    names = {}
+    lines = [f"def {name}({', '.join(parameters)}):"]
+    for node in postorder(formula):
+        if isinstance(node, Atom):
+            if node.name not in index:
+                raise ValueError(f"{node.name} not in symbols.")
+            names[node] = parameters[index[node.name]]
+        else:
+            target = names[node] = 't' + str(len(names))
+            operator = operators[type(node)]
+            operands = [names[child] for child in children(node)]
+            if isinstance(operator, str):
+                lines.append(f"    {target} = {operator.format(*operands)}")
+            elif not operands:
+                lines.append(f"    {target} = {operator[1]}")
+            else:
+                separator = operator[0]
+                lines.append(f"    {target} = {separator.join(operands[:CHUNK])}")
+                for i in range(CHUNK, len(operands), CHUNK):
+                    lines.append(f"    {target} = {separator.join([target] + operands[i:i + CHUNK])}")
+    lines.append(f"    return {result.format(names[formula])}")
+    return '\n'.join(lines) + '\n'
+
+
+def build_function(source, name='evaluate', namespace=None):
+    """Compiles source code produced by generate_source and returns the function it defines."""
+    namespace = dict(namespace or {})
+    exec(compile(source, '<compiled formula>', 'exec'), namespace)
+    return namespace[name]
+
+
+class CompiledFormula:
+    """A formula translated into a Python function over the truth values of its atoms."""
+
+    def __init__(self, formula, symbols):
+        self.formula = formula
+        self.symbols = symbols
+        self.source = generate_source(formula, symbols, BOOLEAN_OPERATORS)
+        self.evaluate = build_function(self.source)
+
+    def __call__(self, interpretation):
+        """Returns the truth value of the formula in an interpretation given as a dictionary."""
+        for symbol in self.symbols:
+            if symbol not in interpretation:
+                raise ValueError(f"{symbol} not in interpretation.")
+        return self.evaluate(*(interpretation[symbol] for symbol in self.symbols))
+
+
+def compile_formula(formula, symbols=None):
+    """Compiles a formula once into a CompiledFormula that can be evaluated many times.
+
+    symbols is the list of atom names that the compiled function takes as arguments.
+    By default, it is the sorted list of names of the atoms of formula.
+    """
+    if symbols is None:
+        symbols = sorted((atom.name for atom in atoms(formula)), key=str)
+    return CompiledFormula(formula, list(symbols))
@@ -0,0 +1,167 @@
+"""This module counts the models of formulas in propositional logic (#SAT).
+
+Enumerating the 2^n interpretations is only feasible for a few atoms. count_models works on
+the Tseitin CNF of the formula (see cnf.py) with the DPLL procedure, and uses two ideas to
+avoid exploring most of the search tree:
+
+- component decomposition: when the remaining clauses split into groups without common
+  variables, the number of models is the product of the numbers of models of the groups;
+- caching: each group of clauses is counted only once, even if it is reached by different
+  partial assignments.
+
+For example, count_models(Or(Atom('p'), Atom('q'))) returns 3.
+"""
+
+from clausedb import ClauseDB
+from cnf import to_clause_db
+
+
+def count_models(formula):
+    """Returns the number of models of formula over its atoms.
+
+    formula may also be a ClauseDB, in which case the models are counted over all of its
+    variables. Since the Tseitin transformation defines each auxiliary variable as a function
+    of the atoms, both counts agree for the ClauseDB built from a formula.
+    """
+    db = formula if isinstance(formula, ClauseDB) else to_clause_db(formula)
+    clauses = []
+    for clause in db:
+        literals = set(clause)
+        if not any(-literal in literals for literal in literals):
+            clauses.append(tuple(sorted(literals)))
+    return _count(clauses, db.number_of_variables)
+
+
+def _simplify(clauses, units):
+    """Assigns the literals in units and propagates the unit clauses.
+
+    Returns None if a clause becomes false. Otherwise, it returns the pair (assigned, remaining)
+    of the set of assigned literals and the list of remaining clauses without false literals.
+    """
+    occurrences = {}
+    queue = list(units)
+    for i, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(i)
+        if len(clause) == 1:
+            queue.append(clause[0])
+        elif not clause:
+            return None
+    assigned = set()
+    while queue:
+        literal = queue.pop()
+        if literal in assigned:
+            continue
+        if -literal in assigned:
+            return None
+        assigned.add(literal)
+        for i in occurrences.get(-literal, ()):
+            unassigned = None
+            for other in clauses[i]:
+                if other in assigned:
+                    break
+                if -other not in assigned:
+                    if unassigned is not None:
+                        break
+                    unassigned = other
+            else:
+                if unassigned is None:
+                    return None
+                queue.append(unassigned)
+    remaining = []
+    for clause in clauses:
+        if not any(literal in assigned for literal in clause):
+            remaining.append(tuple(literal for literal in clause if -literal not in assigned))
+    return assigned, remaining
+
+
+def _components(clauses):
+    """Splits clauses into groups without common variables (each group in a canonical order)."""
+    parent = {}
+
+    def find(variable):
+        root = variable
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while parent[variable] != root:
+            parent[variable], variable = root, parent[variable]
+        return root
+
+    for clause in clauses:
+        root = find(abs(clause[0]))
+        for literal in clause[1:]:
+            other = find(abs(literal))
+            if other != root:
+                parent[other] = root
+    groups = {}
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return [tuple(sorted(group)) for group in groups.values()]
+
+
+def _variables(clauses):
+    return {abs(literal) for clause in clauses for literal in clause}
+
+
+def _branches(component):
+    """Returns the two branches of the DPLL procedure on component as a list of pairs
+    (factor, subcomponents): the number of models of the branch is factor times the product
+    of the numbers of models of the subcomponents."""
+    occurrences = {}
+    for clause in component:
+        for literal in clause:
+            variable = abs(literal)
+            occurrences[variable] = occurrences.get(variable, 0) + 1
+    variable = max(occurrences, key=occurrences.get)
+    branches = []
+    for literal in (variable, -variable):
+        simplified = _simplify(component, [literal])
+        if simplified is None:
+            branches.append((0, []))
+            continue
+        assigned, remaining = simplified
+        free = len(occurrences) - len(assigned) - len(_variables(remaining))
+        branches.append((2 ** free, _components(remaining)))
+    return branches
+
+
+def _count(clauses, number_of_variables):
+    """Returns the number of models of clauses over the variables 1, ..., number_of_variables."""
+    simplified = _simplify(clauses, [])
+    if simplified is None:
+        return 0
+    assigned, remaining = simplified
+    free = number_of_variables - len(assigned) - len(_variables(remaining))
+    cache = {}
+    # the components are counted with an explicit stack of tasks: ('count', component) leaves
+    # the number of models of component in values, and ('combine', component, shape) combines
+    # the values left by the subcomponents of its two branches
+    values = []
+    tasks = [('count', component) for component in _components(remaining)]
+    top = len(tasks)
+    while tasks:
+        task = tasks.pop()
+        component = task[1]
+        if task[0] == 'count':
+            if component in cache:
+                values.append(cache[component])
+                continue
+            branches = _branches(component)
+            tasks.append(('combine', component, [(factor, len(subcomponents)) for factor, subcomponents in branches]))
+            for factor, subcomponents in branches:
+                tasks.extend(('count', subcomponent) for subcomponent in subcomponents)
+        else:
+            # the subcomponents were counted in the reverse order of their tasks, so the value of
+            # the first one is on the top of values
+            total = 0
+            for factor, size in task[2]:
+                product = factor
+                for _ in range(size):
+                    product *= values.pop()
+                total += product
+            cache[component] = total
+            values.append(total)
+    result = 2 ** free
+    for _ in range(top):
+        result *= values.pop()
+    return result
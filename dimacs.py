@@ -0,0 +1,117 @@
+"""This module reads and writes sets of clauses in the DIMACS CNF format.
+
+A DIMACS file has comment lines starting with c, a header p cnf <variables> <clauses>, and
+clauses written as integers terminated by 0. For example, (p v ¬q) ∧ q is written as
+
+c var 1 p
+c var 2 q
+p cnf 2 2
+1 -2 0
+2 0
+
+The comments c var <variable> <name> are used by this module to keep the names of the atoms.
+Other tools simply ignore them.
+
+read_dimacs is a generator, so large files can be processed clause by clause, and load_dimacs
+builds a ClauseDB that can be given directly to the functions of semantics.py:
+
+satisfiability(load_dimacs('problem.cnf'))
+"""
+
+import mmap
+import os
+
+from clausedb import ClauseDB, SymbolTable
+from cnf import to_clause_db
+
+
+def _lines(file):
+    """Yields the lines (as bytes) of a path or of a binary file object, using mmap when possible."""
+    if isinstance(file, (str, bytes, os.PathLike)):
+        with open(file, 'rb') as opened:
+            yield from _lines(opened)
+        return
+    try:
+        size = os.fstat(file.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        size = 0
+    if size == 0:
+        yield from file
+        return
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield from iter(mapped.readline, b'')
+
+
+def read_dimacs(file, symbols=None):
+    """Yields the clauses (lists of integers) of a DIMACS CNF file, one at a time.
+
+    file is a path or a binary file object. If symbols (a SymbolTable) is given, the names
+    found in c var comments are stored in it, and the number of variables of the header is
+    declared in it.
+    """
+    clause = []
+    for line in _lines(file):
+        line = line.strip()
+        if not line:
+            continue
+        first = line[:1]
+        if first == b'c':
+            if symbols is not None:
+                fields = line.split(maxsplit=3)
+                if len(fields) == 4 and fields[1] == b'var':
+                    symbols.set_name(int(fields[2]), fields[3].decode('utf-8'))
+            continue
+        if first == b'p':
+            fields = line.split()
+            if symbols is not None and len(fields) == 4:
+                # variables that occur in no clause still count
+                symbols.ensure_variables(int(fields[2]))
+            continue
+        if first == b'%':
+            # SATLIB files end with a line % followed by a line 0, which is not a clause
+            break
+        for literal in map(int, line.split()):
+            if literal == 0:
+                yield clause
+                clause = []
+            else:
+                clause.append(literal)
+    if clause:
+        yield clause
+
+
+def load_dimacs(file):
+    """Reads a DIMACS CNF file into a ClauseDB.
+
+    If the file has no c var comments, the variables are named by their numbers, so the
+    interpretations returned by the functions of semantics.py use these numbers as keys.
+    Otherwise, variables without a c var comment are auxiliary variables.
+    """
+    symbols = SymbolTable()
+    db = ClauseDB(symbols)
+    for clause in read_dimacs(file, symbols):
+        db.add_clause(clause)
+    if not symbols.variables:
+        for variable in range(1, len(symbols) + 1):
+            symbols.set_name(variable, variable)
+    return db
+
+
+def write_dimacs(problem, file):
+    """Writes a ClauseDB or a formula (converted with the Tseitin transformation) in DIMACS CNF.
+
+    file is a path or a text file object.
+    """
+    if isinstance(file, (str, bytes, os.PathLike)):
+        with open(file, 'w', encoding='utf-8') as opened:
+            write_dimacs(problem, opened)
+        return
+    db = problem if isinstance(problem, ClauseDB) else to_clause_db(problem)
+    for variable in range(1, db.number_of_variables + 1):
+        name = db.symbols.name(variable)
+        if name is not None and name != variable:
+            file.write(f"c var {variable} {name}\n")
+    file.write(f"p cnf {db.number_of_variables} {len(db)}\n")
+    for clause in db:
+        file.write(' '.join(map(str, clause)))
+        file.write(' 0\n' if clause else '0\n')
@@ -1,6 +1,8 @@
 from semantics import *
-from typing import List
-from typing import Union
+from solver import Solver
+from cache import EncodingCache
+from cardinality import exactly_k
+from cnf import to_clause_db
 
 """Campo Minado é um jogo em que o objetivo é limpar uma grade sem detonar nenhuma mina.
 O jogador é apresentado inicialmente com uma grade de quadrados indiferenciados.
@@ -127,12 +129,32 @@ for premise in mines_neighborhood(my_grid):
     print(premise)
 
 
-print(is_logical_consequence(no_mines(my_grid) + mines_neighborhood(my_grid), Atom('1_2')))
-print(is_logical_consequence(no_mines(my_grid) + mines_neighborhood(my_grid), Not(Atom('1_2'))))
-print(is_logical_consequence(no_mines(my_grid) + mines_neighborhood(my_grid), Atom('1_3')))
-print(is_logical_consequence(no_mines(my_grid) + mines_neighborhood(my_grid), Not(Atom('1_3'))))
-print(is_logical_consequence(no_mines(my_grid) + mines_neighborhood(my_grid), Atom('2_0')))
-print(is_logical_consequence(no_mines(my_grid) + mines_neighborhood(my_grid), Not(Atom('2_0'))))
-print(is_logical_consequence(no_mines(my_grid) + mines_neighborhood(my_grid), Atom('3_0')))
-print(is_logical_consequence(no_mines(my_grid) + mines_neighborhood(my_grid), Not(Atom('3_0'))))
-# ======== YOUR CODE HERE ========
+# the formulas above only handle squares with number 1; the cardinality encodings (see cardinality.py)
+# say that there are exactly k mines adjacent to a square with number k, for any k
+
+def mines_premises(grid):
+    premises = to_clause_db(AndN(no_mines(grid)))
+    for i in range(len(grid)):
+        for j in range(len(grid[i])):
+            if grid[i][j] != -1:
+                neighbors = get_adjacent_cells(i, j)
+                neighbors.remove((i, j))
+                atoms = [premises.variable(str(neighbor[0]) + '_' + str(neighbor[1])) for neighbor in neighbors]
+                exactly_k(premises, atoms, grid[i][j], encoding='totalizer')
+    return premises
+
+
+# the clauses of the premises of each grid are kept on disk, so that the same grid is not encoded again
+premises = EncodingCache().clause_db(mines_premises, my_grid)
+
+# the premises are encoded once, and each query below reuses the clauses learned by the previous ones
+solver = Solver()
+solver.add_clause_db(premises)
+for cell in ['1_2', '1_3', '2_0', '3_0']:
+    print(solver.entails(Atom(cell)))
+    print(solver.entails(Not(Atom(cell))))
+
+# all cells that must contain a mine (atoms) or cannot contain a mine (negated atoms), in one call
+print('cells decided by the premises:')
+for literal in sorted(backbone(premises), key=str):
+    print(literal)
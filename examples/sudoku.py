@@ -1,4 +1,5 @@
 from semantics import *
+from cache import EncodingCache
 import time
 
 '''
@@ -34,30 +35,22 @@ def and_all(list_formulas):
     """
     Returns a BIG AND formula from a list of formulas
     For example, if list_formulas is [Atom('1'), Atom('p'), Atom('r')], it returns
-    And(And(Atom('1'), Atom('p')), Atom('r')).
+    AndN([Atom('1'), Atom('p'), Atom('r')]), which represents (1 ∧ p ∧ r).
     :param list_formulas: a list of formulas
-    :return: And formula
+    :return: AndN formula
     """
-    first_formula = list_formulas[0]
-    del list_formulas[0]
-    for formula in list_formulas:
-        first_formula = And(first_formula, formula)
-    return first_formula
+    return AndN(list_formulas)
 
 
 def or_all(list_formulas):
     """
     Returns a BIG OR of formulas from a list of formulas.
     For example, if list_formulas is [Atom('1'), Atom('p'), Atom('r')], it returns
-    Or(Or(Atom('1'), Atom('p')), Atom('r')).
+    OrN([Atom('1'), Atom('p'), Atom('r')]), which represents (1 v p v r).
     :param list_formulas: a list of formulas
-    :return: Or formula
+    :return: OrN formula
     """
-    first_formula = list_formulas[0]
-    del list_formulas[0]
-    for formula in list_formulas:
-        first_formula = Or(first_formula, formula)
-    return first_formula
+    return OrN(list_formulas)
 
 
 # the solution must agree with the given digits:
@@ -165,15 +158,13 @@ def subgrids_constrains(grid):
     return and_all(subgrids_formulas)
 
 
-def sudoku_solution(grid):
+def sudoku_formula(grid):
     """
-    Prints the solution of a sudoku grid, if a solution exists. Otherwise, it prints that solution does not exist.
-    It creates a formula imposing all constraints of the sudoku puzzle, and then uses a
-    satisfiability checking procedure on this formula. The solution of the sudoku can be drawn from a interpretation
-    that satisfies the formula.
+    Returns a formula imposing all constraints of the sudoku puzzle.
     :param grid: sudoku grid
+    :return: And formula
     """
-    final_formula = And(
+    return And(
         And(
             And(
                 given_digits_constraints(grid),
@@ -186,7 +177,21 @@ def sudoku_solution(grid):
         ),
         subgrids_constrains(grid)
     )
-    solution = satisfiability_brute_force(final_formula)
+
+
+# the clauses of the formula of each grid are kept on disk, so that solving the same grid again skips the encoding
+cache = EncodingCache()
+
+
+def sudoku_solution(grid):
+    """
+    Prints the solution of a sudoku grid, if a solution exists. Otherwise, it prints that solution does not exist.
+    It creates a formula imposing all constraints of the sudoku puzzle, and then uses a
+    satisfiability checking procedure on this formula. The solution of the sudoku can be drawn from a interpretation
+    that satisfies the formula.
+    :param grid: sudoku grid
+    """
+    solution = satisfiability(cache.clause_db(sudoku_formula, grid))
     if solution:
         for i in range(len(grid)):
             for j in range(len(grid)):
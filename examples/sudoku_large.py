@@ -0,0 +1,46 @@
+from sudoku_sat import is_solution, solve_sudoku
+
+'''
+Sudokus maiores (9x9, 16x16, 25x25) são codificados diretamente em cláusulas (veja sudoku_sat.py).
+Os dígitos dados são propagados antes da codificação, então só há variáveis para as casas vazias.
+'''
+
+grid_9x9 = [[8, 0, 0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 3, 6, 0, 0, 0, 0, 0],
+            [0, 7, 0, 0, 9, 0, 2, 0, 0],
+            [0, 5, 0, 0, 0, 7, 0, 0, 0],
+            [0, 0, 0, 0, 4, 5, 7, 0, 0],
+            [0, 0, 0, 1, 0, 0, 0, 3, 0],
+            [0, 0, 1, 0, 0, 0, 0, 6, 8],
+            [0, 0, 8, 5, 0, 0, 0, 1, 0],
+            [0, 9, 0, 0, 0, 0, 4, 0, 0]]
+
+grid_16x16 = [[ 0, 14,  0,  5,  0, 11,  0, 15,  7,  0,  0,  9,  0,  0,  0,  0],
+              [ 0,  0,  0,  0,  0,  0, 16,  0,  0, 14,  0,  5,  0,  0,  1,  0],
+              [ 0, 11,  0,  0,  0,  0,  0,  0,  0, 12,  0,  2, 13,  0,  0,  5],
+              [ 8,  0,  0,  2,  0,  0,  0,  0,  3,  0,  1, 15,  0,  0,  4,  0],
+              [ 0,  0,  0,  0, 14,  0,  0,  0, 11,  0, 15,  7,  0,  4,  9,  0],
+              [ 0,  0,  0,  0,  0,  4,  0,  0, 12,  0,  2,  0,  0, 10,  5,  3],
+              [ 0,  0,  5,  0, 11,  0,  0,  7,  0,  0,  9,  0, 12,  0,  0,  0],
+              [ 6,  0,  0,  0,  0, 16,  0,  0, 14,  0,  5,  0,  0,  1,  0,  7],
+              [ 1, 15,  7,  6,  4,  9,  0,  0,  0,  0, 13,  0, 10,  5,  3, 11],
+              [ 0,  0,  0, 12, 16,  0, 13, 14,  0,  0,  0, 11,  0, 15,  0,  0],
+              [ 0,  5,  0,  0,  1, 15,  7,  0,  0,  9,  8, 12, 16,  2,  0,  0],
+              [16,  0,  0, 14, 10,  0,  3,  0,  1, 15,  0,  0,  4,  9,  8,  0],
+              [ 0,  0,  6,  0,  0,  0, 12,  0,  0,  0, 14,  0,  5,  0,  0,  1],
+              [ 0,  0,  0,  0,  5,  0, 11,  0,  0,  7,  0,  0,  9,  0,  0, 16],
+              [ 0,  3,  0,  0,  0,  7,  0,  0,  0,  0, 12,  0,  2, 13,  0,  0],
+              [ 0,  8, 12, 16,  0,  0,  0, 10,  5,  0,  0,  1, 15,  7,  0,  4]]
+
+for grid in [grid_9x9, grid_16x16]:
+    result = solve_sudoku(grid)
+    if result.solution is None:
+        print('Sudoku sem solução!')
+        continue
+    for row in result.solution:
+        print(' '.join('%2d' % digit for digit in row))
+    print('Solução correta:', is_solution(grid, result.solution))
+    print('Variáveis:', result.variables, 'Cláusulas:', result.clauses)
+    print('Tempo de codificação:', result.encode_time)
+    print('Tempo do solver:', result.solve_time)
+    print()
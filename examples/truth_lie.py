@@ -19,3 +19,8 @@ formula = And(Implies(amy_honest, And(Not(amy_honest), Not(bob_honest))),
 
 
 print(satisfiability_brute_force(formula))
+
+# all the situations possible in the puzzle (a single one means that the categories are determined)
+for model in iter_models(formula):
+    print(model)
+print(count_models(formula))
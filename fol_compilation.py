@@ -0,0 +1,109 @@
+"""This module compiles formulas of first-order logic into Python closures.
+
+Each variable of a formula gets a slot, resolved when the formula is compiled: one slot for
+each free variable and one for each quantifier, so a variable bound twice gets two slots. The
+compiled formula is a tree of closures that read the values of variables from a list of slots,
+created for each evaluation. So evaluating a formula writes nothing into the interpretation,
+there is nothing to save and restore around quantifiers, and one interpretation can be queried
+from several threads at once. For example,
+
+compiled = compile_fol(ForAll(Var('x'), Exists(Var('y'), Atom('R', [Var('x'), Var('y')]))))
+compiled(interpretation)   # the truth value of the formula in interpretation
+
+Free variables denote their values in interpretation.variables. Compiled formulas do not depend
+on the interpretation, and the last ones compiled are cached.
+"""
+
+from functools import lru_cache
+
+from fol_formula import And, Atom, Exists, ForAll, Implies, Not, Or
+from term import Con, Fun, Var
+
+
+def variable_name(var):
+    """Returns the name of the variable of a quantifier, which may be a Var or a name."""
+    return var.name if isinstance(var, Var) else var
+
+
+class CompiledFOL:
+    """A formula of first-order logic translated into closures over a list of variable slots.
+
+    free maps the names of the free variables to their slots, and slots is the number of slots.
+    """
+
+    def __init__(self, formula):
+        self.formula = formula
+        self.free = {}
+        self.slots = 0
+        self.evaluate = self._formula(formula, {})
+
+    def __call__(self, interpretation):
+        """Returns the truth value of the formula in interpretation."""
+        environment = [None] * self.slots
+        for name, slot in self.free.items():
+            environment[slot] = interpretation.variables[name]
+        return self.evaluate(interpretation, environment)
+
+    def _slot(self, name, scope):
+        if name in scope:
+            return scope[name]
+        if name not in self.free:
+            self.free[name] = self._new_slot()
+        return self.free[name]
+
+    def _new_slot(self):
+        self.slots += 1
+        return self.slots - 1
+
+    def _term(self, term, scope):
+        if isinstance(term, Var):
+            slot = self._slot(term.name, scope)
+            return lambda interpretation, environment: environment[slot]
+        elif isinstance(term, Con):
+            name = term.name
+            return lambda interpretation, environment: interpretation.constants[name]
+        elif isinstance(term, Fun):
+            name = term.name
+            args = [self._term(arg, scope) for arg in term.args]
+            return lambda interpretation, environment: \
+                interpretation.functions[name][tuple(arg(interpretation, environment) for arg in args)]
+        raise TypeError(f"{term!r} is not a term.")
+
+    def _formula(self, formula, scope):
+        if isinstance(formula, Atom):
+            name = formula.name
+            args = [self._term(arg, scope) for arg in formula.args]
+            return lambda interpretation, environment: \
+                tuple(arg(interpretation, environment) for arg in args) in interpretation.predicates[name]
+        elif isinstance(formula, Not):
+            inner = self._formula(formula.inner, scope)
+            return lambda interpretation, environment: not inner(interpretation, environment)
+        elif isinstance(formula, (And, Or, Implies)):
+            left, right = self._formula(formula.left, scope), self._formula(formula.right, scope)
+            if isinstance(formula, And):
+                return lambda interpretation, environment: \
+                    left(interpretation, environment) and right(interpretation, environment)
+            elif isinstance(formula, Or):
+                return lambda interpretation, environment: \
+                    left(interpretation, environment) or right(interpretation, environment)
+            return lambda interpretation, environment: \
+                not left(interpretation, environment) or right(interpretation, environment)
+        elif isinstance(formula, (ForAll, Exists)):
+            slot = self._new_slot()
+            inner = self._formula(formula.inner, {**scope, variable_name(formula.var): slot})
+            wanted = isinstance(formula, Exists)
+
+            def quantifier(interpretation, environment):
+                for element in interpretation.domain:
+                    environment[slot] = element
+                    if inner(interpretation, environment) == wanted:
+                        return wanted
+                return not wanted
+            return quantifier
+        raise TypeError(f"{formula!r} is not a formula of first-order logic.")
+
+
+@lru_cache(maxsize=1024)
+def compile_fol(formula):
+    """Returns the CompiledFOL of formula."""
+    return CompiledFOL(formula)
@@ -1,9 +1,15 @@
-class FormulaFOL:
+from hashcons import HashConsed
+
+
+class FormulaFOL(HashConsed):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
 
 class Atom(FormulaFOL):
+    __slots__ = _fields = ('name', 'args')
 
     def __init__(self, name, args):
         super().__init__()
@@ -19,20 +25,9 @@ class Atom(FormulaFOL):
                 printable_predicate = printable_predicate + str(self.args[i]) + ', '
         return printable_predicate
 
-    def __eq__(self, other):
-        is_equal = isinstance(other, Atom) and len(other.args) == len(self.args)
-        if not is_equal:
-            return False
-        for i in range(len(self.args)):
-            if self.args[i] != other.args[i]:
-                return False
-        return True
-
-    def __hash__(self):
-        return hash(tuple(self.args) + (self.name, 'atom'))
-
 
 class Implies(FormulaFOL):
+    __slots__ = _fields = ('left', 'right')
 
     def __init__(self, left, right):
         super().__init__()
@@ -42,14 +37,9 @@ class Implies(FormulaFOL):
     def __str__(self):
         return "(" + self.left.__str__() + " " + u"\u27F6" + " " + self.right.__str__() + ")"
 
-    def __eq__(self, other):
-        return isinstance(other, Implies) and other.left == self.left and other.right == self.right
-
-    def __hash__(self):
-        return hash((hash(self.left), hash(self.right), 'implies'))
-
 
 class Not(FormulaFOL):
+    __slots__ = _fields = ('inner',)
 
     def __init__(self, inner):
         super().__init__()
@@ -58,14 +48,9 @@ class Not(FormulaFOL):
     def __str__(self):
         return "(" + u"\u00ac" + str(self.inner) + ")"
 
-    def __eq__(self, other):
-        return isinstance(other, Not) and other.inner == self.inner
-
-    def __hash__(self):
-        return hash((hash(self.inner), 'not'))
-
 
 class And(FormulaFOL):
+    __slots__ = _fields = ('left', 'right')
 
     def __init__(self, left, right):
         super().__init__()
@@ -75,14 +60,9 @@ class And(FormulaFOL):
     def __str__(self):
         return "(" + self.left.__str__() + " " + u"\u2227" + " " + self.right.__str__() + ")"
 
-    def __eq__(self, other):
-        return isinstance(other, And) and other.left == self.left and other.right == self.right
-
-    def __hash__(self):
-        return hash((hash(self.left), hash(self.right), 'and'))
-
 
 class Or(FormulaFOL):
+    __slots__ = _fields = ('left', 'right')
 
     def __init__(self, left, right):
         super().__init__()
@@ -92,14 +72,9 @@ class Or(FormulaFOL):
     def __str__(self):
         return "(" + self.left.__str__() + " " + u"\u2228" + " " + self.right.__str__() + ")"
 
-    def __eq__(self, other):
-        return isinstance(other, Or) and other.left == self.left and other.right == self.right
-
-    def __hash__(self):
-        return hash((hash(self.left), hash(self.right), 'or'))
-
 
 class ForAll(FormulaFOL):
+    __slots__ = _fields = ('var', 'inner')
 
     def __init__(self, var, inner):
         super().__init__()
@@ -109,14 +84,9 @@ class ForAll(FormulaFOL):
     def __str__(self):
         return "(" + u"\u2200" + str(self.var) + str(self.inner) + ")"
 
-    def __eq__(self, other):
-        return isinstance(other, ForAll) and other.inner == self.inner and other.var == self.var
-
-    def __hash__(self):
-        return hash((hash(self.inner), 'all', hash(self.var)))
-
 
 class Exists(FormulaFOL):
+    __slots__ = _fields = ('var', 'inner')
 
     def __init__(self, var, inner):
         super().__init__()
@@ -125,9 +95,3 @@ class Exists(FormulaFOL):
 
     def __str__(self):
         return "(" + u"\u2203" + str(self.var) + str(self.inner) + ")"
-
-    def __eq__(self, other):
-        return isinstance(other, Exists) and other.var == self.var and other.inner == self.inner
-
-    def __hash__(self):
-        return hash((hash(self.inner), 'exists', hash(self.var)))
@@ -7,9 +7,21 @@ formula1 = Or(Atom('p'), Atom('s'))
 As another example, the piece of code below creates an object that represents (p → (p v s)).
 
 formula2 = Implies(Atom('p'), Or(Atom('p'), Atom('s')))
+
+AndN and OrN are conjunctions and disjunctions of any number of formulas. For example,
+AndN([Atom('p'), Atom('q'), Atom('r')]) represents (p ∧ q ∧ r). Prefer them to long chains of
+And and Or, which are deep and slow to traverse.
+
+Formulas are hash-consed (see hashcons.py): structurally equal formulas are the same object,
+so comparing two formulas with == is as cheap as comparing them with is.
 """
 
-class Formula:
+from hashcons import HashConsed
+
+
+class Formula(HashConsed):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -22,6 +34,8 @@ class Atom(Formula):
     This class represents propositional logic variables.
     """
 
+    __slots__ = _fields = ('name',)
+
     def __init__(self, name: str):
         super().__init__()
         self.name = name
@@ -29,14 +43,10 @@ class Atom(Formula):
     def __str__(self):
         return str(self.name)
 
-    def __eq__(self, other: Formula):
-        return isinstance(other, Atom) and other.name == self.name
-
-    def __hash__(self):
-        return hash((self.name, 'atom'))
-
 
 class Implies(Formula):
+    __slots__ = _fields = ('left', 'right')
+
     def __init__(self, left: Formula, right: Formula):
         super().__init__()
         self.left = left
@@ -45,14 +55,10 @@ class Implies(Formula):
     def __str__(self):
         return f"({self.left} \u2192 {self.right})"
 
-    def __eq__(self, other: Formula):
-        return isinstance(other, Implies) and other.left == self.left and other.right == self.right
-
-    def __hash__(self):
-        return hash((hash(self.left), hash(self.right), 'implies'))
-
 
 class Not(Formula):
+    __slots__ = _fields = ('inner',)
+
     def __init__(self, inner: Formula):
         super().__init__()
         self.inner = inner
@@ -60,14 +66,10 @@ class Not(Formula):
     def __str__(self):
         return f"(\u00ac{self.inner})"
 
-    def __eq__(self, other: Formula):
-        return isinstance(other, Not) and other.inner == self.inner
-
-    def __hash__(self):
-        return hash((hash(self.inner), 'not'))
-
 
 class And(Formula):
+    __slots__ = _fields = ('left', 'right')
+
     def __init__(self, left: Formula, right: Formula):
         super().__init__()
         self.left = left
@@ -76,14 +78,10 @@ class And(Formula):
     def __str__(self):
         return f"({self.left} \u2227 {self.right})"
 
-    def __eq__(self, other: Formula):
-        return isinstance(other, And) and other.left == self.left and other.right == self.right
-
-    def __hash__(self):
-        return hash((hash(self.left), hash(self.right), 'and'))
-
 
 class Or(Formula):
+    __slots__ = _fields = ('left', 'right')
+
     def __init__(self, left: Formula, right: Formula):
         super().__init__()
         self.left = left
@@ -92,14 +90,10 @@ class Or(Formula):
     def __str__(self):
         return f"({self.left} \u2228 {self.right})"
 
-    def __eq__(self, other: Formula):
-        return isinstance(other, Or) and other.left == self.left and other.right == self.right
-
-    def __hash__(self):
-        return hash((hash(self.left), hash(self.right), 'or'))
-
 
 class Iff(Formula):
+    __slots__ = _fields = ('left', 'right')
+
     def __init__(self, left: Formula, right: Formula):
         super().__init__()
         self.left = left
@@ -108,14 +102,10 @@ class Iff(Formula):
     def __str__(self):
         return f"({self.left} \u2194 {self.right})"
 
-    def __eq__(self, other: Formula):
-        return isinstance(other, Iff) and other.left == self.left and other.right == self.right
-
-    def __hash__(self):
-        return hash((hash(self.left), hash(self.right), 'iff'))
 
+class Xor(Formula):
+    __slots__ = _fields = ('left', 'right')
 
-class Xor(Formula):      
     def __init__(self, left: Formula, right: Formula):
         super().__init__()
         self.left = left
@@ -124,8 +114,36 @@ class Xor(Formula):
     def __str__(self):
         return f"({self.left} \u2295 {self.right})"
 
-    def __eq__(self, other: Formula):
-        return isinstance(other, Xor) and other.left == self.left and other.right == self.right
 
-    def __hash__(self):
-        return hash((hash(self.left), hash(self.right), 'xor'))
\ No newline at end of file
+class AndN(Formula):
+    """
+    This class represents the conjunction of a list of formulas (true if the list is empty).
+    """
+
+    __slots__ = _fields = ('args',)
+
+    def __init__(self, args):
+        super().__init__()
+        self.args = args
+
+    def __str__(self):
+        if not self.args:
+            return "\u22a4"
+        return "(" + " \u2227 ".join(map(str, self.args)) + ")"
+
+
+class OrN(Formula):
+    """
+    This class represents the disjunction of a list of formulas (false if the list is empty).
+    """
+
+    __slots__ = _fields = ('args',)
+
+    def __init__(self, args):
+        super().__init__()
+        self.args = args
+
+    def __str__(self):
+        if not self.args:
+            return "\u22a5"
+        return "(" + " \u2228 ".join(map(str, self.args)) + ")"
@@ -2,17 +2,216 @@
 do some computation on its syntactic structure. """
 
 
-from formula import Atom, And, Implies, Not, Or
+import weakref
+from collections import OrderedDict, namedtuple
 
+from formula import Atom, And, AndN, Not, Or, OrN
 
-def length(formula):
-    """Determines the length of a formula in propositional logic."""
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'reused', 'maxsize', 'currsize'])
+
+
+class AnalysisCache:
+    """A bounded table (least recently used entries are dropped first) of derived properties
+    of formulas, such as their atoms or their length, keyed on (property name, formula).
+
+    Formulas are held through weak references, so an entry is dropped as soon as its formula
+    is garbage collected. Since formulas are hash-consed, a cached result is found again
+    whenever the same formula (or a structurally equal one) is analyzed, and also when it
+    occurs inside a larger formula.
+
+    hits and misses count the queries of get, and reused counts the subformulas whose cached
+    value was reused by reuse during an analysis.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.table = OrderedDict()
+        self.names = set()
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+
+    def _lookup(self, name, formula):
+        key = (name, weakref.ref(formula))
+        value = self.table.get(key)
+        if value is not None:
+            self.table.move_to_end(key)
+        return value
+
+    def get(self, name, formula):
+        """Returns the cached value of property name for formula (None if it is not cached),
+        counting a hit or a miss."""
+        value = self._lookup(name, formula)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def reuse(self, name, formula):
+        """Returns the cached value of property name for a subformula being analyzed (None if
+        it is not cached). Only reused values are counted, since most subformulas are never
+        queried."""
+        value = self._lookup(name, formula)
+        if value is not None:
+            self.reused += 1
+        return value
+
+    def put(self, name, formula, value):
+        self.names.add(name)
+        key = (name, weakref.ref(formula, self._forget))
+        self.table[key] = value
+        self.table.move_to_end(key)
+        if len(self.table) > self.maxsize:
+            self.table.popitem(last=False)
+
+    def offer(self, name, formula, value):
+        """Caches the value of property name for a subformula computed on the way, if the cache
+        is not full: values of subformulas never evict other entries."""
+        if len(self.table) < self.maxsize:
+            self.put(name, formula, value)
+
+    def _forget(self, ref):
+        """Removes the entries of a formula that was garbage collected."""
+        for name in self.names:
+            self.table.pop((name, ref), None)
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.reused, self.maxsize, len(self.table))
+
+    def clear(self):
+        self.table.clear()
+        self.hits = self.misses = self.reused = 0
+
+
+analysis_cache = AnalysisCache()
+
+
+def cache_info():
+    """Returns the hits, misses, reused subformulas, maximum size and current size of the cache of
+    length, subformulas, atoms and number_of_connectives."""
+    return analysis_cache.info()
+
+
+def cache_clear():
+    """Empties the cache of length, subformulas, atoms and number_of_connectives."""
+    analysis_cache.clear()
+
+
+def children(formula):
+    """Returns the tuple of immediate subformulas of a formula."""
     if isinstance(formula, Atom):
-        return 1
+        return ()
     if isinstance(formula, Not):
-        return length(formula.inner) + 1
-    if isinstance(formula, Implies) or isinstance(formula, And) or isinstance(formula, Or):
-        return length(formula.left) + length(formula.right) + 1
+        return (formula.inner,)
+    if isinstance(formula, (AndN, OrN)):
+        return formula.args
+    return (formula.left, formula.right)
+
+
+def with_children(formula, new_children):
+    """Returns a formula with the same connective as formula and the given immediate subformulas."""
+    if isinstance(formula, (AndN, OrN)):
+        return formula.__class__(tuple(new_children))
+    return formula.__class__(*new_children)
+
+
+def postorder(formula):
+    """Yields every distinct subformula of a formula exactly once, children before parents.
+
+    The traversal uses an explicit stack instead of recursion, so it works on formulas of
+    any depth (for example, the long chains of And built in examples/sudoku.py).
+    Shared subformulas are visited only once, so the cost is linear in the number of
+    distinct subformulas.
+    """
+    visited = set()
+    stack = [(formula, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node
+        elif node not in visited:
+            visited.add(node)
+            stack.append((node, True))
+            for child in reversed(children(node)):
+                if child not in visited:
+                    stack.append((child, False))
+
+
+def fold(formula, function, known=None):
+    """Computes a value bottom-up over a formula without recursion.
+
+    function(node, values) is called once for each distinct subformula, where values is
+    the list of values already computed for the immediate subformulas of node.
+    For example, fold(formula, lambda node, values: 1 + sum(values)) is the length of formula.
+
+    If known is given, known(node) may return the value of a subformula computed before
+    (or None), and then the subformulas of node are not visited.
+    """
+    values = {}
+    stack = [(formula, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            values[node] = function(node, [values[child] for child in children(node)])
+        elif node not in values:
+            value = known(node) if known is not None else None
+            values[node] = value
+            if value is None:
+                stack.append((node, True))
+                for child in reversed(children(node)):
+                    if child not in values:
+                        stack.append((child, False))
+    return values[formula]
+
+
+def _cached_fold(name, formula, function):
+    """Computes fold(formula, function) reusing the values of property name in the cache.
+    The values of the subformulas computed on the way are offered to the cache too."""
+    value = analysis_cache.get(name, formula)
+    if value is None:
+        def computed(node, values):
+            result = function(node, values)
+            analysis_cache.offer(name, node, result)
+            return result
+        value = fold(formula, computed, lambda node: analysis_cache.reuse(name, node))
+        analysis_cache.put(name, formula, value)
+    return value
+
+
+def _cached_collect(name, formula, select):
+    """Returns the frozenset of the subformulas of formula for which select is True,
+    reusing the sets of property name in the cache.
+
+    The cache keeps the set without the formula itself, since a value that refers to its
+    formula would keep it alive. Only the sets of the formulas queried are cached: caching the
+    set of every subformula would take quadratic memory on long chains of connectives."""
+    found = analysis_cache.get(name, formula)
+    if found is None:
+        found = set()
+        visited = {formula}
+        stack = list(children(formula))
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            if select(node):
+                found.add(node)
+            cached = analysis_cache.reuse(name, node)
+            if cached is not None:
+                found.update(cached)
+                continue
+            stack.extend(children(node))
+        found = frozenset(found)
+        analysis_cache.put(name, formula, found)
+    return found | {formula} if select(formula) else found
+
+
+def length(formula):
+    """Determines the length of a formula in propositional logic."""
+    return _cached_fold('length', formula, lambda node, values: 1 + sum(values))
 
 
 def subformulas(formula):
@@ -26,16 +225,10 @@ def subformulas(formula):
 
     This piece of code prints p, s, (p v s), (p → (p v s))
     (Note that there is no repetition of p)
+    The result is a frozenset, since it is kept in the cache of this module.
     """
 
-    if isinstance(formula, Atom):
-        return {formula}
-    if isinstance(formula, Not):
-        return {formula}.union(subformulas(formula.inner))
-    if isinstance(formula, Implies) or isinstance(formula, And) or isinstance(formula, Or):
-        sub1 = subformulas(formula.left)
-        sub2 = subformulas(formula.right)
-        return {formula}.union(sub1).union(sub2)
+    return _cached_collect('subformulas', formula, lambda node: True)
 
 #  we have shown in class that, for all formula A, len(subformulas(A)) <= length(A).
 
@@ -51,16 +244,10 @@ def atoms(formula):
 
     This piece of code above prints: p, s
     (Note that there is no repetition of p)
+    The result is a frozenset, since it is kept in the cache of this module.
     """
     
-    if isinstance(formula, Atom):
-        return {formula}
-    if isinstance(formula, Not):
-        return atoms(formula.inner)
-    if isinstance(formula, Implies) or isinstance(formula, And) or isinstance(formula, Or):
-        atoms1 = atoms(formula.left)
-        atoms2 = atoms(formula.right)
-        return atoms1.union(atoms2)
+    return _cached_collect('atoms', formula, lambda node: isinstance(node, Atom))
 
 
 def number_of_atoms(formula):
@@ -77,47 +264,49 @@ def number_of_atoms(formula):
 def number_of_connectives(formula):
     """Returns the number of connectives occurring in a formula."""
 
-    if isinstance(formula, Atom):
-        return 0
-    if isinstance(formula, Not):
-        return number_of_connectives(formula.inner) + 1
-    if isinstance(formula, Implies) or isinstance(formula, And) or isinstance(formula, Or):
-        return number_of_connectives(formula.left) + number_of_connectives(formula.right) + 1
+    return _cached_fold('number_of_connectives', formula,
+                        lambda node, values: 0 if isinstance(node, Atom) else 1 + sum(values))
 
 
 def is_literal(formula):
     """Returns True if formula is a literal. It returns False, otherwise"""
     
-    if isinstance(formula, Atom):
-        return True
-    if isinstance(formula, Not):
-        return is_literal(formula.inner)
-    else:
-        return False
+    while isinstance(formula, Not):
+        formula = formula.inner
+    return isinstance(formula, Atom)
 
 
 def substitution(formula, old_subformula, new_subformula):
     """Returns a new formula obtained by replacing all occurrences
     of old_subformula in the input formula by new_subformula."""
 
-    if isinstance(formula, Atom):
-        return new_subformula if formula == old_subformula else formula
-    if isinstance(formula, Not):
-        return new_subformula if formula == old_subformula else Not(substitution(formula.inner, old_subformula, new_subformula))
-    if isinstance(formula, Implies) or isinstance(formula, And) or isinstance(formula, Or):
-        return new_subformula if formula == old_subformula else formula.__class__(substitution(formula.left, old_subformula, new_subformula), substitution(formula.right, old_subformula, new_subformula))
+    def replace(node, values):
+        if node == old_subformula:
+            return new_subformula
+        if all(value is child for value, child in zip(values, children(node))):
+            return node
+        return with_children(node, values)
+
+    return fold(formula, replace)
 
 
 def is_clause(formula):
     """Returns True if formula is a clause. It returns False, otherwise"""
     
-    if isinstance(formula, Atom):
-        return True
-    elif isinstance(formula, Not):
-        return isinstance(formula.inner, Atom)
-    elif isinstance(formula, Or):
-        return is_clause(formula.left) and is_clause(formula.right)
-    return False
+    stack = [formula]
+    while stack:
+        formula = stack.pop()
+        if isinstance(formula, Or):
+            stack.append(formula.left)
+            stack.append(formula.right)
+        elif isinstance(formula, OrN):
+            stack.extend(formula.args)
+        elif isinstance(formula, Not):
+            if not isinstance(formula.inner, Atom):
+                return False
+        elif not isinstance(formula, Atom):
+            return False
+    return True
 
 
 def is_negation_normal_form(formula):
@@ -129,9 +318,17 @@ def is_negation_normal_form(formula):
 def is_cnf(formula):
     """Returns True if formula is in conjunctive normal form.
     Returns False, otherwise."""
-    if isinstance(formula, And):
-        return is_cnf(formula.left) and is_cnf(formula.right)
-    return is_clause(formula)
+    stack = [formula]
+    while stack:
+        formula = stack.pop()
+        if isinstance(formula, And):
+            stack.append(formula.left)
+            stack.append(formula.right)
+        elif isinstance(formula, AndN):
+            stack.extend(formula.args)
+        elif not is_clause(formula):
+            return False
+    return True
 
 
 def is_term(formula):
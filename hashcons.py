@@ -0,0 +1,124 @@
+"""This module provides hash-consing (interning) for the syntax trees of formulas and terms.
+
+Every class built on HashConsed keeps a table of its live instances, so that building
+a node that is structurally equal to an existing one returns the existing object.
+For example,
+
+And(Atom('p'), Atom('q')) is And(Atom('p'), Atom('q'))
+
+is True. As a consequence, equality between formulas is just identity, the hash of a
+node is its identity hash (constant time, without walking the node), and structurally
+identical subformulas are stored only once in memory.
+
+Nodes are immutable: after construction, assigning to one of their attributes raises
+AttributeError.
+"""
+
+import threading
+from collections.abc import Iterable
+import weakref
+
+
+_table = {}
+# reentrant, since the garbage collector may call _forget while the table is being updated
+_lock = threading.RLock()
+
+
+class InternMeta(type):
+    """Metaclass that returns the already existing node when a structurally equal one is requested."""
+
+    def __call__(cls, *args, **kwargs):
+        if kwargs:
+            args = args + tuple(kwargs.pop(field) for field in cls._fields[len(args):] if field in kwargs)
+            if kwargs:
+                raise TypeError(f"{cls.__name__}() got unexpected arguments {', '.join(kwargs)}")
+        for arg in args:
+            if not isinstance(arg, HashConsed):
+                # lists of arguments (as in Atom('P', [Var('x')])), sets and dictionary views are
+                # frozen into tuples so that they can be hashed and equal the same tuple, and
+                # generators (as in OrN(Atom(name) for name in names)) so that they can be read again
+                args = tuple([_frozen(arg) for arg in args])
+                key = (cls,) + tuple([arg if isinstance(arg, HashConsed) else _key(arg) for arg in args])
+                break
+        else:
+            key = (cls,) + args
+        ref = _table.get(key)
+        if ref is not None:
+            node = ref()
+            if node is not None:
+                return node
+        with _lock:
+            ref = _table.get(key)
+            node = ref() if ref is not None else None
+            if node is None:
+                if len(args) != len(cls._fields):
+                    raise TypeError(f"{cls.__name__}() takes {len(cls._fields)} arguments ({len(args)} given)")
+                # the fields are set directly: the __init__ methods of nodes only document them
+                node = object.__new__(cls)
+                for field, arg in zip(cls._fields, args):
+                    _set(node, field, arg)
+                _table[key] = weakref.KeyedRef(node, _forget, key)
+        return node
+
+
+_set = object.__setattr__
+
+
+def _frozen(arg):
+    if type(arg) is not tuple and not isinstance(arg, (str, bytes)) and isinstance(arg, Iterable):
+        return tuple(arg)
+    return arg
+
+
+def _key(arg):
+    """Returns the part of the key of a node for an argument that is not a node.
+
+    Values are paired with their types, so that equal values of different types (1, 1.0 and
+    True) give different nodes.
+    """
+    if type(arg) is tuple:
+        return tuple([item if isinstance(item, HashConsed) else _key(item) for item in arg])
+    return type(arg), arg
+
+
+def _forget(ref):
+    """Removes a dead node from the table (called by the garbage collector)."""
+    with _lock:
+        if _table.get(ref.key) is ref:
+            del _table[ref.key]
+
+
+class HashConsed(metaclass=InternMeta):
+    """Base class of interned nodes.
+
+    Subclasses list the constructor arguments in _fields (in the same order as in __init__)
+    and declare them in __slots__. Nodes are built by InternMeta, which assigns the fields
+    directly, so __init__ must do nothing but store its arguments.
+    """
+
+    __slots__ = ('__weakref__',)
+    _fields = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    # equal nodes are the same object, so the identity hash (computed in C, without walking the
+    # node) is consistent with equality
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, field) for field in self._fields)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def interned_count():
+    """Returns the number of live interned nodes (formulas and terms)."""
+    return len(_table)
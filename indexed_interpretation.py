@@ -0,0 +1,284 @@
+"""This module defines a compact representation of interpretations for first-order logic.
+
+An Interpretation (see interpretation_fol.py) stores predicates as sets of tuples of elements and
+functions as dictionaries from tuples of elements. For domains with thousands of elements and
+relations with millions of tuples, these tuples take most of the memory and most of the time
+goes into hashing them. An IndexedInterpretation numbers the elements of the domain 0, 1, 2, ...
+(their codes) and stores
+
+- each relation as a sorted array of keys, where the key of a tuple of codes (c1, ..., ck) is
+  the number c1 c2 ... ck written in base |domain|, plus a bitset of the keys when the relation
+  is small enough, and an index of its tuples by the code in each position, built on demand
+  (keys too large for 64-bit integers are stored as Python integers);
+- each function as a dense array of codes indexed by the key of its arguments.
+
+So atoms and terms are evaluated with arithmetic and array lookups. The constructor takes the
+same arguments as Interpretation, for example (see interpretation_fol.py)
+
+interpretation = IndexedInterpretation(domain={1, 2, 3},
+                                       predicates={'R': {(1, 2), (2, 1)}},
+                                       functions={'g': {(1,): 2, (2,): 3, (3,): 2}},
+                                       constants={'a': 1},
+                                       variables={'x': 2})
+interpretation.truth_value(Exists(Var('y'), Atom('R', [Var('y'), Fun('g', [Con('a')])])))   # True
+
+NumPy is used for the arrays if it is installed, and the array module otherwise.
+"""
+
+from array import array
+from bisect import bisect_left
+
+from fol_formula import And, Atom, Exists, ForAll, Implies, Not, Or
+from term import Con, Fun, Var
+from interpretation_fol import Interpretation
+from fol_compilation import variable_name
+
+
+# relations over at most this number of possible tuples also get a bitset
+BITSET_MAX_BITS = 1 << 24
+
+# functions with at most this number of possible arguments are stored as dense arrays
+DENSE_MAX_ENTRIES = 1 << 26
+
+# relations with more possible tuples than this have keys that do not fit in 64-bit integers
+KEY_MAX = (1 << 63) - 1
+
+# code of undefined function values in dense arrays
+UNDEFINED = -1
+
+
+def numpy_module():
+    """Returns the numpy module, or None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class Relation:
+    """A relation over the codes 0, ..., size - 1 of the elements of a domain."""
+
+    def __init__(self, rows, arity, size):
+        self.arity = arity
+        self.size = size
+        self.bits = None
+        self._indexes = {}
+        # keys that do not fit in 64 bits are kept as Python integers in a list
+        self.wide = size ** arity > KEY_MAX
+        np = numpy_module() if not self.wide else None
+        if np is not None:
+            rows = np.array(rows, dtype=np.int64).reshape(len(rows), arity)
+            weights = size ** np.arange(arity - 1, -1, -1, dtype=np.int64)
+            self.keys = np.unique(rows @ weights)
+            if size ** arity <= BITSET_MAX_BITS:
+                bits = np.zeros(size ** arity, dtype=bool)
+                bits[self.keys] = True
+                self.bits = bytearray(np.packbits(bits, bitorder='little'))
+            return
+        keys = sorted({self.key(row) for row in rows})
+        self.keys = keys if self.wide else array('q', keys)
+        if size ** arity <= BITSET_MAX_BITS:
+            self.bits = bytearray((size ** arity + 7) // 8)
+            for key in keys:
+                self.bits[key >> 3] |= 1 << (key & 7)
+
+    def key(self, codes):
+        """Returns the key of a tuple of codes."""
+        key = 0
+        for code in codes:
+            key = key * self.size + code
+        return key
+
+    def codes(self, key):
+        """Returns the tuple of codes of a key."""
+        codes = []
+        for _ in range(self.arity):
+            key, code = divmod(key, self.size)
+            codes.append(code)
+        return tuple(reversed(codes))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def has_key(self, key):
+        """Returns True if the tuple with the given key is in the relation."""
+        if not len(self.keys):
+            return False
+        if self.bits is not None:
+            return bool(self.bits[key >> 3] >> (key & 7) & 1)
+        keys = self.keys
+        i = int(keys.searchsorted(key)) if hasattr(keys, 'searchsorted') else bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def __contains__(self, codes):
+        return self.has_key(self.key(codes))
+
+    def __iter__(self):
+        """Yields the tuples of codes of the relation in increasing order of their keys."""
+        for key in self.keys:
+            yield self.codes(int(key))
+
+    def index(self, position):
+        """Returns the index of the relation by the code in position, a pair (keys, starts):
+        the keys of the tuples with code c in position are keys[starts[c]:starts[c + 1]]."""
+        if position not in self._indexes:
+            weight = self.size ** (self.arity - 1 - position)
+            np = numpy_module() if not self.wide else None
+            if np is not None:
+                column = (self.keys // weight) % self.size
+                order = np.argsort(column, kind='stable')
+                starts = np.searchsorted(column[order], np.arange(self.size + 1))
+                self._indexes[position] = (self.keys[order], starts)
+            else:
+                buckets = [[] for _ in range(self.size)]
+                for key in self.keys:
+                    buckets[key // weight % self.size].append(key)
+                keys, starts = ([] if self.wide else array('q')), array('q', [0])
+                for bucket in buckets:
+                    keys.extend(bucket)
+                    starts.append(len(keys))
+                self._indexes[position] = (keys, starts)
+        return self._indexes[position]
+
+    def keys_with(self, position, code):
+        """Returns the keys of the tuples of the relation with the given code in position."""
+        keys, starts = self.index(position)
+        return keys[starts[code]:starts[code + 1]]
+
+
+class Function:
+    """A function over the codes 0, ..., size - 1 of the elements of a domain."""
+
+    def __init__(self, table, arity, size):
+        self.arity = arity
+        self.size = size
+        self.dense = size ** arity <= DENSE_MAX_ENTRIES
+        if self.dense:
+            np = numpy_module()
+            if np is not None:
+                self.values = np.full(size ** arity, UNDEFINED, dtype=np.int32)
+            else:
+                self.values = array('i', [UNDEFINED]) * (size ** arity)
+        else:
+            self.values = {}
+        for codes, value in table:
+            key = 0
+            for code in codes:
+                key = key * size + code
+            self.values[key] = value
+
+    def at_key(self, key):
+        """Returns the code of the value of the function at the arguments with the given key."""
+        value = int(self.values[key]) if self.dense else self.values.get(key, UNDEFINED)
+        if value == UNDEFINED:
+            raise KeyError(key)
+        return value
+
+
+class IndexedInterpretation(Interpretation):
+    """An interpretation for first-order logic with elements numbered and tables stored in arrays.
+
+    The attributes domain, constants and variables are as in Interpretation. elements lists the
+    elements by code and codes maps each element to its code. relations and function_tables map
+    the names of the predicates and functions to Relation and Function objects.
+    """
+
+    def __init__(self, domain, predicates, functions, constants, variables):
+        self.domain = domain
+        self.constants = constants
+        self.variables = variables
+        try:
+            self.elements = sorted(domain)
+        except TypeError:
+            self.elements = list(domain)
+        self.codes = {element: code for code, element in enumerate(self.elements)}
+        size = len(self.elements)
+        codes = self.codes
+        # when the domain is 0, 1, 2, ..., the elements are their own codes
+        identity = self.elements == list(range(size))
+        self.relations = {}
+        for name, rows in predicates.items():
+            rows = list(rows) if identity else [tuple(codes[element] for element in row) for row in rows]
+            arity = len(rows[0]) if rows else 0
+            self.relations[name] = Relation(rows, arity, size)
+        self.function_tables = {}
+        for name, table in functions.items():
+            table = [(tuple(codes[element] for element in args), codes[value]) for args, value in table.items()]
+            arity = len(table[0][0]) if table else 0
+            self.function_tables[name] = Function(table, arity, size)
+        self.constant_codes = {name: codes[element] for name, element in constants.items()}
+
+    @classmethod
+    def from_interpretation(cls, interpretation):
+        """Builds the IndexedInterpretation of an Interpretation."""
+        return cls(interpretation.domain, interpretation.predicates, interpretation.functions,
+                   interpretation.constants, interpretation.variables)
+
+    @property
+    def size(self):
+        return len(self.elements)
+
+    def interpretation_term(self, term):
+        """Returns the the interpretation (an element of the domain) of term in the interpretation."""
+        return self.elements[self.term_code(term, self._environment())]
+
+    def truth_value(self, formula, vectorized=False):
+        """Returns the the truth-value of an input first-order formula in the interpretation.
+        If vectorized is True, quantifiers are evaluated with NumPy arrays (see vectorized_fol.py)."""
+        if vectorized:
+            from vectorized_fol import vectorized_truth_value
+            return vectorized_truth_value(self, formula)
+        return self.formula_value(formula, self._environment())
+
+    def _environment(self):
+        return {name: self.codes[element] for name, element in self.variables.items()}
+
+    def term_code(self, term, environment):
+        """Returns the code of the interpretation of term, where environment maps variable names to codes."""
+        if isinstance(term, Var):
+            return environment[term.name]
+        elif isinstance(term, Con):
+            return self.constant_codes[term.name]
+        elif isinstance(term, Fun):
+            key = 0
+            for arg in term.args:
+                key = key * len(self.elements) + self.term_code(arg, environment)
+            return self.function_tables[term.name].at_key(key)
+        raise TypeError(f"{term!r} is not a term.")
+
+    def formula_value(self, formula, environment):
+        """Returns the truth value of formula, where environment maps variable names to codes.
+
+        environment is modified during the evaluation of quantifiers and restored afterwards.
+        """
+        if isinstance(formula, Atom):
+            key = 0
+            for arg in formula.args:
+                key = key * len(self.elements) + self.term_code(arg, environment)
+            return self.relations[formula.name].has_key(key)
+        elif isinstance(formula, Not):
+            return not self.formula_value(formula.inner, environment)
+        elif isinstance(formula, Implies):
+            return not self.formula_value(formula.left, environment) or self.formula_value(formula.right, environment)
+        elif isinstance(formula, And):
+            return self.formula_value(formula.left, environment) and self.formula_value(formula.right, environment)
+        elif isinstance(formula, Or):
+            return self.formula_value(formula.left, environment) or self.formula_value(formula.right, environment)
+        elif isinstance(formula, (ForAll, Exists)):
+            name = variable_name(formula.var)
+            wanted = isinstance(formula, Exists)
+            missing = object()
+            saved = environment.get(name, missing)
+            result = not wanted
+            for code in range(len(self.elements)):
+                environment[name] = code
+                if self.formula_value(formula.inner, environment) == wanted:
+                    result = wanted
+                    break
+            if saved is missing:
+                del environment[name]
+            else:
+                environment[name] = saved
+            return result
+        raise TypeError(f"{formula!r} is not a formula of first-order logic.")
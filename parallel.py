@@ -0,0 +1,131 @@
+"""This module evaluates truth tables on several processes.
+
+The truth table of a formula with n atoms is split into 2**k parts by fixing the truth values
+of its first k atoms, and each part is evaluated with bitwise operations (see bitparallel.py)
+by a process of a concurrent.futures.ProcessPoolExecutor. As soon as a process finds what it is
+looking for (a model or a counterexample), it sets an event shared with all processes and the
+others stop at their next block.
+
+The processes are started by the first search and reused by the next ones (shutdown stops
+them). The formula is sent with each part, in the binary format of serialization.py instead of
+a pickled tree of objects, and each process compiles it once. For example,
+
+parallel_is_valid(formula, processes=8)
+parallel_model(formula)        # uses os.cpu_count() processes
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import product
+
+from functions import atoms
+from bitparallel import BLOCK_BITS, BitParallelFormula
+from serialization import dumps, loads
+
+
+# number of parts of the truth table for each process, so that a process that finishes early
+# takes another part
+PARTS_PER_PROCESS = 4
+
+
+_worker = {}
+
+# executors (and the events that stop their searches) by number of processes
+_executors = {}
+_lock = threading.Lock()
+
+
+def _initialize(stop):
+    _worker['stop'] = stop
+
+
+def _compiled(data, symbols, block_bits):
+    """Returns the formula of the current search, compiled on its first part in this process."""
+    key = (data, symbols, block_bits)
+    if _worker.get('key') != key:
+        _worker['formula'] = BitParallelFormula(loads(data), symbols, block_bits)
+        _worker['key'] = key
+    return _worker['formula']
+
+
+def _search_part(data, symbols, block_bits, prefix, value):
+    """Searches the part of the truth table starting with the truth values in prefix for an
+    interpretation in which the formula has the given truth value."""
+    stop = _worker['stop']
+    formula = _compiled(data, symbols, block_bits)
+    for rest in product((True, False), repeat=formula.fixed - len(prefix)):
+        if stop.is_set():
+            return None
+        fixed_values = prefix + rest
+        bits = formula.block(fixed_values)
+        if not value:
+            bits ^= formula.full
+        if bits:
+            stop.set()
+            return formula.first_model(fixed_values, bits)
+    return None
+
+
+def _executor(processes):
+    """Returns the executor with processes processes and its stop event, started on first use."""
+    if processes not in _executors:
+        context = multiprocessing.get_context()
+        stop = context.Event()
+        executor = ProcessPoolExecutor(processes, mp_context=context, initializer=_initialize, initargs=(stop,))
+        _executors[processes] = executor, stop
+    return _executors[processes]
+
+
+def shutdown():
+    """Stops the processes started by the searches of this module."""
+    with _lock:
+        for executor, _ in _executors.values():
+            executor.shutdown(cancel_futures=True)
+        _executors.clear()
+
+
+def parallel_search(formula, value, processes=None):
+    """Returns an interpretation (as a dictionary) in which formula has the given truth value,
+    or None if there is none. The truth table is evaluated by processes processes (by default,
+    os.cpu_count()).
+    """
+    processes = processes or os.cpu_count() or 1
+    symbols = tuple(sorted((atom.name for atom in atoms(formula)), key=str))
+    split = min(len(symbols), (processes * PARTS_PER_PROCESS - 1).bit_length())
+    block_bits = min(BLOCK_BITS, len(symbols) - split)
+    data = dumps(formula)
+    with _lock:
+        executor, stop = _executor(processes)
+        stop.clear()
+        futures = []
+        try:
+            for prefix in product((True, False), repeat=split):
+                futures.append(executor.submit(_search_part, data, symbols, block_bits, prefix, value))
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    return result
+        except BrokenProcessPool:
+            del _executors[processes]
+            raise
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            # the parts still running stop at their next block, before the next search clears stop
+            wait(futures)
+    return None
+
+
+def parallel_is_valid(formula, processes=None):
+    """Returns True if formula is valid, searching for a counterexample on several processes."""
+    return parallel_search(formula, False, processes) is None
+
+
+def parallel_model(formula, processes=None):
+    """Returns a model of formula (not necessarily the first in the truth table) or False."""
+    model = parallel_search(formula, True, processes)
+    return False if model is None else model
@@ -0,0 +1,152 @@
+"""This module reads formulas in propositional logic from text.
+
+For example,
+
+parse('(p ∧ ¬q) → r')
+parse('(p & ~q) -> r')
+parse('p and not q implies r')
+
+all return Implies(And(Atom('p'), Not(Atom('q'))), Atom('r')).
+
+The connectives, from the highest to the lowest precedence, are
+
+¬  ~  !  not                negation
+∧  &  /\\  and               conjunction
+∨  |  \\/  or                disjunction
+⊕  ^  xor                   exclusive or
+→  ->  =>  implies          implication (right associative)
+↔  <->  <=>  iff            biconditional (right associative)
+
+Atom names are sequences of letters, digits and underscores (such as p, q1 or 2_3_4), or any
+text between single or double quotes (such as 'reuniao na segunda').
+
+The parser uses an explicit stack of operators (precedence climbing without recursion), so
+it reads formulas of any size and nesting depth in linear time. A chain of three or more
+conjunctions (or disjunctions) such as p ∧ q ∧ r becomes one AndN (or OrN) of the conjuncts
+instead of a nested tree, so long chains can be evaluated without deep recursion.
+"""
+
+import re
+
+from formula import Atom, And, AndN, Iff, Implies, Not, Or, OrN, Xor
+
+
+_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<name>\w+)
+  | '(?P<single>[^']*)'
+  | "(?P<double>[^"]*)"
+  | (?P<operator><->|<=>|->|=>|/\\|\\/|[¬~!∧&∨|⊕^→↔])
+  | (?P<open>\()
+  | (?P<close>\))
+  | (?P<error>.)
+''', re.VERBOSE)
+
+_OPERATORS = {
+    '¬': Not, '~': Not, '!': Not, 'not': Not,
+    '∧': And, '&': And, '/\\': And, 'and': And,
+    '∨': Or, '|': Or, '\\/': Or, 'or': Or,
+    '⊕': Xor, '^': Xor, 'xor': Xor,
+    '→': Implies, '->': Implies, '=>': Implies, 'implies': Implies,
+    '↔': Iff, '<->': Iff, '<=>': Iff, 'iff': Iff,
+}
+
+_PRECEDENCE = {Not: 5, And: 4, Or: 3, Xor: 2, Implies: 1, Iff: 0}
+
+_RIGHT_ASSOCIATIVE = {Implies, Iff}
+
+# chains of these connectives are collected on the stack and reduced at once
+_N_ARY = {And: AndN, Or: OrN}
+
+_OPEN = '('
+
+
+def tokenize(text):
+    """Yields the tokens of text as pairs (kind, value, position).
+
+    kind is 'name' (value is the atom name), 'operator' (value is the class of the connective),
+    'open' or 'close'.
+    """
+    for match in _TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        if kind == 'name':
+            value = match.group('name')
+            if value in _OPERATORS:
+                yield 'operator', _OPERATORS[value], match.start()
+            else:
+                yield 'name', value, match.start()
+        elif kind == 'single' or kind == 'double':
+            yield 'name', match.group(kind), match.start()
+        elif kind == 'operator':
+            yield 'operator', _OPERATORS[match.group('operator')], match.start()
+        elif kind == 'error':
+            raise ValueError(f"unexpected character {match.group()!r} at position {match.start()}.")
+        else:
+            yield kind, None, match.start()
+
+
+def _reduce(operators, operands):
+    """Applies the connective on the top of the stack of operators to its operands."""
+    connective = operators.pop()
+    if connective is Not:
+        operands.append(Not(operands.pop()))
+    elif connective in _N_ARY and operators and operators[-1] is connective:
+        count = 3
+        operators.pop()
+        while operators and operators[-1] is connective:
+            operators.pop()
+            count += 1
+        args = tuple(operands[-count:])
+        del operands[-count:]
+        operands.append(_N_ARY[connective](args))
+    else:
+        right = operands.pop()
+        operands.append(connective(operands.pop(), right))
+
+
+def parse(text):
+    """Returns the formula (see formula.py) written in text.
+    Raises ValueError if text is not a well-formed formula."""
+    operators = []
+    operands = []
+    expect_operand = True
+    position = 0
+    for kind, value, position in tokenize(text):
+        if expect_operand:
+            if kind == 'name':
+                operands.append(Atom(value))
+                expect_operand = False
+            elif kind == 'open':
+                operators.append(_OPEN)
+            elif value is Not:
+                operators.append(Not)
+            else:
+                raise ValueError(f"expected a formula at position {position}.")
+        elif kind == 'operator' and value is not Not:
+            precedence = _PRECEDENCE[value]
+            right_associative = value in _RIGHT_ASSOCIATIVE
+            while operators and operators[-1] is not _OPEN:
+                top = _PRECEDENCE[operators[-1]]
+                if top > precedence or (top == precedence and not right_associative and value not in _N_ARY):
+                    _reduce(operators, operands)
+                else:
+                    break
+            operators.append(value)
+            expect_operand = True
+        elif kind == 'close':
+            while operators and operators[-1] is not _OPEN:
+                _reduce(operators, operands)
+            if not operators:
+                raise ValueError(f"unbalanced ')' at position {position}.")
+            operators.pop()
+        else:
+            raise ValueError(f"expected a connective or ')' at position {position}.")
+    if expect_operand:
+        raise ValueError(f"unexpected end of formula at position {len(text)}.")
+    while operators:
+        if operators[-1] is _OPEN:
+            raise ValueError("unbalanced '('.")
+        _reduce(operators, operands)
+    return operands[0]
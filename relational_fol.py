@@ -0,0 +1,271 @@
+"""This module checks formulas of first-order logic with relational algebra.
+
+Interpretation.truth_value (see interpretation_fol.py) and vectorized_fol.py enumerate all
+values of the quantified variables, so they take |D|^k steps for k nested quantifiers even when
+the relations are small. Here a formula with free variables is evaluated into a table: a set of
+rows of codes (see indexed_interpretation.py) of the values of its variables that satisfy it, or
+that falsify it (a negated table), so
+
+- an atom is a scan of its relation, which uses the index of the relation by position when an
+  argument is ground;
+- a conjunction is a join of the tables of its conjuncts, joining the smallest tables first and
+  preferring tables that share variables with the rows joined so far; negated tables become
+  anti-joins;
+- a disjunction or an implication is a conjunction by De Morgan's laws;
+- a negation swaps a table with its negated table, without computing the complement;
+- an existential quantifier is a projection, and a universal quantifier is ∀x φ = ¬∃x ¬φ.
+
+So the cost follows the sizes of the relations rather than the size of the domain. Complements
+against the domain are computed only when they cannot be avoided: the rows of a table are
+extended with every element of the domain for the variables of a negated table it does not
+have, and atoms whose arguments are compound terms with variables are checked for every value
+of their variables. For example,
+
+interpretation = IndexedInterpretation(...)
+relational_truth_value(interpretation, formula)
+"""
+
+from itertools import product
+
+from fol_formula import And, Atom, Exists, ForAll, Implies, Not, Or
+from term import Con, Fun, Var
+from indexed_interpretation import IndexedInterpretation, variable_name
+
+
+class Table:
+    """A set of rows of codes of the values of variables (a sorted tuple of names).
+    If negated is True, the table stands for the rows that are not in rows."""
+
+    __slots__ = ('variables', 'rows', 'negated')
+
+    def __init__(self, variables, rows, negated=False):
+        if not variables and negated:
+            rows, negated = {()} - rows, False
+        self.variables = variables
+        self.rows = rows
+        self.negated = negated
+
+    def negation(self):
+        return Table(self.variables, self.rows, not self.negated)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+TRUE = Table((), {()})
+FALSE = Table((), set())
+
+
+def _columns(variables, of):
+    """Returns the positions in of (a tuple of names) of variables."""
+    return [of.index(name) for name in variables]
+
+
+def _project(rows, positions):
+    return {tuple(row[i] for i in positions) for row in rows}
+
+
+def _join(a, b):
+    """Returns the join of two positive tables, built as a hash join on the smaller one."""
+    if len(b) < len(a):
+        a, b = b, a
+    variables = tuple(sorted(set(a.variables) | set(b.variables)))
+    shared = [name for name in a.variables if name in b.variables]
+    a_shared, b_shared = _columns(shared, a.variables), _columns(shared, b.variables)
+    b_extra = [i for i, name in enumerate(b.variables) if name not in a.variables]
+    order = _columns(variables, a.variables + tuple(b.variables[i] for i in b_extra))
+    buckets = {}
+    for row in a.rows:
+        buckets.setdefault(tuple(row[i] for i in a_shared), []).append(row)
+    rows = set()
+    for row in b.rows:
+        matches = buckets.get(tuple(row[i] for i in b_shared))
+        if matches:
+            extra = tuple(row[i] for i in b_extra)
+            for match in matches:
+                joined = match + extra
+                rows.add(tuple(joined[i] for i in order))
+    return Table(variables, rows)
+
+
+class RelationalEvaluator:
+    """Evaluates formulas over an IndexedInterpretation into Tables."""
+
+    def __init__(self, interpretation):
+        if not isinstance(interpretation, IndexedInterpretation):
+            interpretation = IndexedInterpretation.from_interpretation(interpretation)
+        self.interpretation = interpretation
+        self.size = interpretation.size
+        self._tables = {}
+
+    def _extend(self, table, variables):
+        """Returns the rows of a positive table extended with every value of the variables it does not have."""
+        missing = tuple(name for name in variables if name not in table.variables)
+        if not missing:
+            return table
+        extended = tuple(sorted(table.variables + missing))
+        order = _columns(extended, table.variables + missing)
+        rows = set()
+        for values in product(range(self.size), repeat=len(missing)):
+            for row in table.rows:
+                joined = row + values
+                rows.add(tuple(joined[i] for i in order))
+        return Table(extended, rows)
+
+    def _anti_join(self, table, negated):
+        """Returns the rows of a positive table that agree with no row of a negated table."""
+        table = self._extend(table, negated.variables)
+        positions = _columns(negated.variables, table.variables)
+        rows = {row for row in table.rows if tuple(row[i] for i in positions) not in negated.rows}
+        return Table(table.variables, rows)
+
+    def atom(self, formula):
+        """Returns the table of the values of the variables of an atom that satisfy it."""
+        interpretation = self.interpretation
+        relation = interpretation.relations[formula.name]
+        args = formula.args
+        variables = tuple(sorted({name for arg in args for name in _variables(arg)}))
+        if not len(relation):
+            return Table(variables, set())
+        if any(isinstance(arg, Fun) and _variables(arg) for arg in args):
+            # compound terms with variables are evaluated for every value of the variables
+            rows = set()
+            for values in product(range(self.size), repeat=len(variables)):
+                environment = dict(zip(variables, values))
+                key = 0
+                for arg in args:
+                    key = key * self.size + interpretation.term_code(arg, environment)
+                if relation.has_key(key):
+                    rows.add(values)
+            return Table(variables, rows)
+        ground = {i: interpretation.term_code(arg, {}) for i, arg in enumerate(args) if not isinstance(arg, Var)}
+        if not variables:
+            return TRUE if tuple(ground[i] for i in range(len(args))) in relation else FALSE
+        if ground:
+            position = min(ground)
+            keys = relation.keys_with(position, ground[position])
+        else:
+            keys = relation.keys
+        first = {}
+        for i, arg in enumerate(args):
+            if isinstance(arg, Var):
+                first.setdefault(arg.name, i)
+        positions = [first[name] for name in variables]
+        rows = set()
+        for key in keys:
+            codes = relation.codes(int(key))
+            if all(codes[i] == code for i, code in ground.items()) and \
+                    all(codes[i] == codes[first[arg.name]] for i, arg in enumerate(args) if isinstance(arg, Var)):
+                rows.add(tuple(codes[i] for i in positions))
+        return Table(variables, rows)
+
+    def conjunction(self, tables):
+        """Returns the table of the conjunction of tables."""
+        positives = sorted((table for table in tables if not table.negated), key=len)
+        negatives = [table for table in tables if table.negated]
+        if any(not table.rows for table in positives):
+            return FALSE
+        if not positives:
+            # ¬A ∧ ¬B is ¬(A ∨ B)
+            variables = tuple(sorted({name for table in negatives for name in table.variables}))
+            rows = set()
+            for table in negatives:
+                rows |= self._extend(table.negation(), variables).rows
+            return Table(variables, rows, negated=True)
+        result = positives.pop(0)
+        while positives or negatives:
+            # anti-joins with the negated tables whose variables are bound shrink the rows first
+            covered = [table for table in negatives if set(table.variables) <= set(result.variables)]
+            if covered:
+                for table in covered:
+                    result = self._anti_join(result, table)
+                    negatives.remove(table)
+            elif positives:
+                # then the smallest table sharing variables, so that cross products come last
+                connected = [table for table in positives if set(table.variables) & set(result.variables)]
+                table = (connected or positives)[0]
+                positives.remove(table)
+                result = _join(result, table)
+            else:
+                result = self._anti_join(result, negatives.pop(0))
+            if not result.rows:
+                return FALSE
+        return result
+
+    def exists(self, name, table):
+        """Returns the table of ∃name φ, where table is the table of φ."""
+        if self.size == 0:
+            return FALSE
+        if name not in table.variables:
+            return table
+        axis = table.variables.index(name)
+        variables = table.variables[:axis] + table.variables[axis + 1:]
+        positions = [i for i in range(len(table.variables)) if i != axis]
+        if not table.negated:
+            return Table(variables, _project(table.rows, positions))
+        # ∃x ¬T holds for the values of the other variables that have fewer than |D| rows in T
+        counts = {}
+        for row in table.rows:
+            rest = tuple(row[i] for i in positions)
+            counts[rest] = counts.get(rest, 0) + 1
+        return Table(variables, {rest for rest, count in counts.items() if count == self.size}, negated=True)
+
+    def formula(self, formula):
+        """Returns the table of formula."""
+        if formula in self._tables:
+            return self._tables[formula]
+        if isinstance(formula, Atom):
+            table = self.atom(formula)
+        elif isinstance(formula, Not):
+            table = self.formula(formula.inner).negation()
+        elif isinstance(formula, And):
+            table = self.conjunction([self.formula(conjunct) for conjunct in _flatten(formula, And)])
+        elif isinstance(formula, Or):
+            table = self.conjunction([self.formula(disjunct).negation() for disjunct in _flatten(formula, Or)])
+            table = table.negation()
+        elif isinstance(formula, Implies):
+            table = self.conjunction([self.formula(formula.left), self.formula(formula.right).negation()])
+            table = table.negation()
+        elif isinstance(formula, Exists):
+            table = self.exists(variable_name(formula.var), self.formula(formula.inner))
+        elif isinstance(formula, ForAll):
+            table = self.exists(variable_name(formula.var), self.formula(formula.inner).negation()).negation()
+        else:
+            raise TypeError(f"{formula!r} is not a formula of first-order logic.")
+        self._tables[formula] = table
+        return table
+
+
+def _variables(term):
+    """Returns the names of the variables of a term."""
+    if isinstance(term, Var):
+        return {term.name}
+    elif isinstance(term, Con):
+        return set()
+    elif isinstance(term, Fun):
+        return set().union(*(_variables(arg) for arg in term.args))
+    raise TypeError(f"{term!r} is not a term.")
+
+
+def _flatten(formula, connective):
+    """Returns the operands of a chain of binary connectives, from left to right."""
+    operands = []
+    stack = [formula]
+    while stack:
+        formula = stack.pop()
+        if isinstance(formula, connective):
+            stack.append(formula.right)
+            stack.append(formula.left)
+        else:
+            operands.append(formula)
+    return operands
+
+
+def relational_truth_value(interpretation, formula):
+    """Returns the truth value of formula in an interpretation (an Interpretation or an
+    IndexedInterpretation), where free variables denote their values in interpretation.variables."""
+    evaluator = RelationalEvaluator(interpretation)
+    interpretation = evaluator.interpretation
+    table = evaluator.formula(formula)
+    row = tuple(interpretation.codes[interpretation.variables[name]] for name in table.variables)
+    return (row in table.rows) != table.negated
@@ -1,8 +1,27 @@
 """The goal in this module is to define functions associated with the semantics of formulas in propositional logic. """
 
 
+from itertools import product
+
 from formula import *
 from functions import atoms
+from compilation import compile_formula
+from bitparallel import BLOCK_BITS, BitParallelCNF, BitParallelFormula
+from bdd import BDD, TRUE
+from cdcl import CDCL
+from clausedb import ClauseDB
+from cnf import to_clause_db
+from parallel import parallel_is_valid, parallel_model
+from solver import Solver
+from counting import count_models
+
+
+# truth tables over at least this number of atoms are computed with bitwise operations
+BIT_PARALLEL_MIN_ATOMS = 6
+
+# formulas with at least this number of atoms (more than a single block of the bitwise truth
+# table) are checked with BDDs (see bdd.py)
+BDD_MIN_ATOMS = BLOCK_BITS + 1
 
 
 def truth_value(formula, interpretation):
@@ -22,84 +41,151 @@ def truth_value(formula, interpretation):
         return not truth_value(formula.left, interpretation) or truth_value(formula.right, interpretation)
     elif isinstance(formula, Or):
         return truth_value(formula.left, interpretation) or truth_value(formula.right, interpretation)
+    elif isinstance(formula, Iff):
+        return truth_value(formula.left, interpretation) == truth_value(formula.right, interpretation)
+    elif isinstance(formula, Xor):
+        return truth_value(formula.left, interpretation) != truth_value(formula.right, interpretation)
+    elif isinstance(formula, AndN):
+        return all(truth_value(inner, interpretation) for inner in formula.args)
+    elif isinstance(formula, OrN):
+        return any(truth_value(inner, interpretation) for inner in formula.args)
 
 
-def is_logical_consequence(premises, conclusion):  # function TT-Entails? in the book AIMA.
-    """Returns True if the conclusion is a logical consequence of the set of premises. Otherwise, it returns False."""
-    
-    symbols = atoms(conclusion)
-    for formula in premises:
-        symbols = symbols.union(atoms(formula))
-    
-    symbols = [ symb.name for symb in symbols ]
+def symbols_of(*formulas):
+    """Returns the sorted list of atom names occurring in the given formulas."""
+    symbols = set()
+    for formula in formulas:
+        symbols.update(atom.name for atom in atoms(formula))
+    return sorted(symbols, key=str)
 
-    def PL_TRUE(KB, model):
-        for sen in KB:
-            if not truth_value(sen, model): return False
-        return True
-    
-    def TT_CHECK_ALL(KB, a, symbols, model):
-        if len(symbols) == 0:
-            if PL_TRUE(KB, model):
-                return PL_TRUE([a], model)
-            else:
-                return True
-        else:
-            p = symbols[0]
-            rest = symbols[1:]
-            return (TT_CHECK_ALL(KB, a, rest, {**model, p : True})
-                    and TT_CHECK_ALL(KB, a, rest, {**model, p : False}))
-
-    return TT_CHECK_ALL(premises, conclusion, symbols, {})
-
-def is_logical_equivalence(formula1, formula2):
-    """Checks whether formula1 and formula2 are logically equivalent."""
-    
-    symbols = atoms(formula1)
-    symbols = [ formula.name for formula in symbols ]
 
-    def check_both(form1, form2, symbols, model):
-        if len(symbols) == 0:
-            return truth_value(form1, model) == truth_value(form2, model)
-        p = symbols[0]
-        rest = symbols[1:]
-        return (check_both(form1, form2, rest, {**model, p : True})
-                and check_both(form1, form2, rest, {**model, p : False}))
+def interpretations(symbols):
+    """Yields the tuples of truth values of all interpretations of symbols."""
+    return product((True, False), repeat=len(symbols))
 
-    return check_both(formula1, formula2, symbols, {})
 
-
-def is_valid(formula):
-    """Returns True if formula is a logically valid (tautology). Otherwise, it returns False"""
-
-    symbols = atoms(formula)
-    symbols = [symb.name for symb in symbols]
-
-    def check_all(form, symbols, model):
-        if len(symbols) == 0:
-            return truth_value(form, model)
-        p = symbols[0]
-        rest = symbols[1:]
-        return (check_all(form, rest, {**model, p : True}) and
-                check_all(form, rest, {**model, p : False}))
+def is_logical_consequence(premises, conclusion, processes=None):  # function TT-Entails? in the book AIMA.
+    """Returns True if the conclusion is a logical consequence of the set of premises. Otherwise, it returns False.
+    If processes is given, the truth table is evaluated by this number of processes (see parallel.py)."""
     
-    return check_all(formula, symbols, {})
+    return is_valid(Implies(AndN(tuple(premises)), conclusion), processes)
 
 
-def satisfiability_brute_force(formula):
+def is_logical_equivalence(formula1, formula2):
+    """Checks whether formula1 and formula2 are logically equivalent."""
+    
+    if len(symbols_of(formula1, formula2)) >= BDD_MIN_ATOMS:
+        bdd = BDD()
+        return bdd.build(formula1) == bdd.build(formula2)
+    return is_valid(Iff(formula1, formula2))
+
+
+def is_valid(formula, processes=None):
+    """Returns True if formula is a logically valid (tautology). Otherwise, it returns False
+    If processes is given, the truth table is evaluated by this number of processes (see parallel.py)."""
+
+    if isinstance(formula, ClauseDB):
+        return BitParallelCNF(formula).is_valid()
+    if processes is not None:
+        return parallel_is_valid(formula, processes)
+    symbols = symbols_of(formula)
+    if len(symbols) >= BDD_MIN_ATOMS:
+        return BDD().build(formula) == TRUE
+    if len(symbols) >= BIT_PARALLEL_MIN_ATOMS:
+        return BitParallelFormula(formula, symbols).is_valid()
+    evaluate = compile_formula(formula, symbols).evaluate
+    return all(evaluate(*values) for values in interpretations(symbols))
+
+
+def satisfiability_brute_force(formula, processes=None):
     """Checks whether formula is satisfiable.
     In other words, if the input formula is satisfiable, it returns an interpretation that assigns true to the formula.
-    Otherwise, it returns False."""
-
-    symbols = atoms(formula)
-    symbols = [symb.name for symb in symbols]
-
-    def check_all(form, symbols, model):
-        if len(symbols) == 0:
-            return model if truth_value(form, model) else False
-        p = symbols[0]
-        rest = symbols[1:]
-        left = check_all(form, rest, {**model, p : True})
-        return left if left else check_all(form, rest, {**model, p : False})
-    
-    return check_all(formula, symbols, {})
\ No newline at end of file
+    Otherwise, it returns False.
+    If processes is given, the truth table is evaluated by this number of processes (see parallel.py)."""
+
+    if isinstance(formula, ClauseDB):
+        model = BitParallelCNF(formula).model()
+        return model and formula.model_names(model)
+    if processes is not None:
+        return parallel_model(formula, processes)
+    symbols = symbols_of(formula)
+    if len(symbols) >= BDD_MIN_ATOMS:
+        bdd = BDD()
+        return bdd.model(bdd.build(formula))
+    if len(symbols) >= BIT_PARALLEL_MIN_ATOMS:
+        return BitParallelFormula(formula, symbols).model()
+    evaluate = compile_formula(formula, symbols).evaluate
+    for values in interpretations(symbols):
+        if evaluate(*values):
+            return dict(zip(symbols, values))
+    return False
+
+
+def satisfiability(formula):
+    """Checks whether formula is satisfiable with a CDCL SAT solver.
+    As satisfiability_brute_force, it returns an interpretation that assigns true to the formula
+    if the formula is satisfiable. Otherwise, it returns False.
+    formula may also be a ClauseDB (see clausedb.py)."""
+
+    db = formula if isinstance(formula, ClauseDB) else to_clause_db(formula)
+    solver = CDCL()
+    solver.ensure_variables(db.number_of_variables)
+    for clause in db:
+        solver.add_clause(clause)
+    if not solver.solve():
+        return False
+    return db.model_names(solver.model)
+
+
+def iter_models(formula, limit=None):
+    """Yields the models of formula (interpretations over its atoms, as dictionaries), one at a
+    time. If limit is given, at most limit models are generated. For example,
+    list(iter_models(formula, limit=2)) has one element if and only if formula has a unique model.
+
+    After each model, a blocking clause excluding it is added to the solver, so that the next
+    call finds a different one.
+    """
+
+    solver = Solver([formula])
+    variables = [(name, solver.variable(name)) for name in symbols_of(formula)]
+    generated = 0
+    while limit is None or generated < limit:
+        if not solver.solve():
+            return
+        model = solver.model
+        yield {name: model[name] for name, _ in variables}
+        generated += 1
+        solver.add_clause([-variable if model[name] else variable for name, variable in variables])
+
+
+def backbone(premises):
+    """Returns the set of literals (atoms and negations of atoms) that are logical consequences
+    of the set of premises. For example, the backbone of [p ∨ q, ¬q] is {p, ¬q}.
+    If the premises are unsatisfiable, it returns False. premises may also be a ClauseDB.
+
+    Instead of checking each literal with is_logical_consequence, the candidates are the
+    literals true in a first model, and every model found later removes the candidates false
+    in it, so most atoms are decided by a single call of the solver.
+    """
+
+    if isinstance(premises, ClauseDB):
+        solver = Solver()
+        solver.add_clause_db(premises)
+    else:
+        solver = Solver(premises)
+    if not solver.solve():
+        return False
+    candidates = dict(solver.model)
+    names = list(candidates)
+    result = set()
+    for name in names:
+        if name not in candidates:
+            continue
+        literal = Atom(name) if candidates.pop(name) else Not(Atom(name))
+        if solver.solve([Not(literal)]):
+            model = solver.model
+            candidates = {other: value for other, value in candidates.items() if model[other] == value}
+        else:
+            result.add(literal)
+            solver.add(literal)
+    return result
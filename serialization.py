@@ -0,0 +1,197 @@
+"""This module writes formulas and terms in a compact binary format and reads them back.
+
+pickle stores a formula as nested objects: it recurses on deep formulas and stores a shared
+subformula once per occurrence. This format stores a formula as a table of its distinct nodes
+in topological order (children before parents) and a table of the strings used as names, so
+it is read with a single loop and shared subformulas are written once. For example,
+
+data = dumps(And(Atom('p'), Not(Atom('p'))))
+loads(data) is And(Atom('p'), Not(Atom('p')))     # True (see hashcons.py)
+
+The format works for formulas of propositional logic (formula.py), formulas of first-order
+logic (fol_formula.py) and terms (term.py). All numbers are unsigned 32-bit little-endian words:
+
+magic (4 bytes, b'LGCF')
+version
+number of strings, number of nodes, number of words in the node table
+length in bytes of each string
+node table
+strings (UTF-8)
+
+Each node in the node table is its type (an index in NODE_TYPES) followed by its fields, in the
+order of the attribute _fields of its class. A field that is a node, a string or an integer is a
+single word index * 4 (node), index * 4 + 1 (string) or index * 4 + 3 (integer, such as the atoms
+of dimacs.py, written in decimal in the table of strings), and a field that is a tuple of these
+is the word length * 4 + 2 followed by one word per element. The last node is the root.
+Version 1 of the format had no integers, so files of version 1 are read as well.
+"""
+
+import mmap
+import os
+import sys
+from array import array
+
+import fol_formula
+import formula
+import term
+from hashcons import HashConsed
+
+
+MAGIC = b'LGCF'
+VERSION = 2
+
+# the position of a class in this tuple is its type in the format, so new classes go at the end
+NODE_TYPES = (
+    formula.Atom, formula.Not, formula.And, formula.Or, formula.Implies, formula.Iff, formula.Xor,
+    formula.AndN, formula.OrN,
+    fol_formula.Atom, fol_formula.Not, fol_formula.And, fol_formula.Or, fol_formula.Implies,
+    fol_formula.ForAll, fol_formula.Exists,
+    term.Con, term.Var, term.Fun,
+)
+
+_type_numbers = {node_type: number for number, node_type in enumerate(NODE_TYPES)}
+
+NODE, STRING, TUPLE, INTEGER = 0, 1, 2, 3
+
+HEADER_WORDS = 4
+
+
+def _words(data):
+    """Returns the words in data (a bytes-like object) as an array of integers."""
+    words = array('I')
+    words.frombytes(data)
+    if sys.byteorder == 'big':
+        words.byteswap()
+    return words
+
+
+def _to_bytes(words):
+    if sys.byteorder == 'big':
+        words = array('I', words)
+        words.byteswap()
+    return words.tobytes()
+
+
+def dumps(root):
+    """Returns root (a formula or a term) in the binary format as bytes."""
+    strings = []
+    string_numbers = {}
+    node_numbers = {}
+    table = array('I')
+
+    def word(value):
+        if isinstance(value, HashConsed):
+            return node_numbers[value] * 4 + NODE
+        if isinstance(value, str):
+            kind = STRING
+        elif type(value) is int:
+            value, kind = str(value), INTEGER
+        else:
+            raise TypeError(f"cannot serialize {value!r}: names must be strings or integers.")
+        if value not in string_numbers:
+            string_numbers[value] = len(strings)
+            strings.append(value)
+        return string_numbers[value] * 4 + kind
+
+    # postorder over all node fields, with an explicit stack
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node in node_numbers:
+            continue
+        if type(node) not in _type_numbers:
+            raise TypeError(f"cannot serialize objects of type {type(node).__name__}.")
+        values = [getattr(node, field) for field in node._fields]
+        if not expanded:
+            stack.append((node, True))
+            for value in reversed(values):
+                for item in reversed(value) if isinstance(value, tuple) else (value,):
+                    if isinstance(item, HashConsed) and item not in node_numbers:
+                        stack.append((item, False))
+            continue
+        table.append(_type_numbers[type(node)])
+        for value in values:
+            if isinstance(value, tuple):
+                table.append(len(value) * 4 + TUPLE)
+                table.extend(word(item) for item in value)
+            else:
+                table.append(word(value))
+        node_numbers[node] = len(node_numbers)
+    encoded = [string.encode('utf-8') for string in strings]
+    header = array('I', [VERSION, len(strings), len(node_numbers), len(table)])
+    header.extend(len(string) for string in encoded)
+    return b''.join([MAGIC, _to_bytes(header), _to_bytes(table)] + encoded)
+
+
+def loads(data):
+    """Reads a formula or a term written by dumps from a bytes-like object (for example, an mmap)."""
+    with memoryview(data) as view:
+        if view[:4] != MAGIC:
+            raise ValueError("not a serialized formula (wrong magic number).")
+        if len(view) < 4 + 4 * HEADER_WORDS:
+            raise ValueError("truncated serialized formula.")
+        version, number_of_strings, number_of_nodes, number_of_words = _words(view[4:4 + 4 * HEADER_WORDS])
+        if not 1 <= version <= VERSION:
+            raise ValueError(f"unsupported version {version} of the serialization format.")
+        start = 4 + 4 * HEADER_WORDS
+        end = start + 4 * (number_of_strings + number_of_words)
+        if len(view) < end:
+            raise ValueError("truncated serialized formula.")
+        words = _words(view[start:end])
+        strings = []
+        position = end
+        for length in words[:number_of_strings]:
+            strings.append(str(view[position:position + length], 'utf-8'))
+            position += length
+        if position > len(view):
+            raise ValueError("truncated serialized formula.")
+    nodes = []
+
+    def value(word):
+        kind, index = word & 3, word >> 2
+        if kind == NODE:
+            return nodes[index]
+        return strings[index] if kind == STRING else int(strings[index])
+
+    i = number_of_strings
+    while i < len(words):
+        node_type = NODE_TYPES[words[i]]
+        i += 1
+        fields = []
+        for _ in node_type._fields:
+            word = words[i]
+            i += 1
+            if word & 3 == TUPLE:
+                length = word >> 2
+                fields.append(tuple(value(item) for item in words[i:i + length]))
+                i += length
+            else:
+                fields.append(value(word))
+        nodes.append(node_type(*fields))
+    if len(nodes) != number_of_nodes or not nodes:
+        raise ValueError("corrupted serialized formula.")
+    return nodes[-1]
+
+
+def dump(root, file):
+    """Writes root (a formula or a term) in the binary format to a path or a binary file object."""
+    if isinstance(file, (str, bytes, os.PathLike)):
+        with open(file, 'wb') as opened:
+            dump(root, opened)
+        return
+    file.write(dumps(root))
+
+
+def load(file):
+    """Reads a formula or a term from a path or a binary file object, using mmap when possible."""
+    if isinstance(file, (str, bytes, os.PathLike)):
+        with open(file, 'rb') as opened:
+            return load(opened)
+    try:
+        size = os.fstat(file.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        size = 0
+    if size == 0:
+        return loads(file.read())
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return loads(mapped)
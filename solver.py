@@ -0,0 +1,92 @@
+"""This module defines an incremental SAT solver for formulas in propositional logic.
+
+A Solver keeps premises, encoded once into clauses (see cnf.py), and answers many questions
+about them. Each question is a call of solve with assumptions, which only hold during the
+call, so the clauses learned to answer one question are reused by the next ones.
+For example, the following piece of code checks which cells of a minesweeper grid must
+contain a mine with a single solver (see examples/mines.py).
+
+solver = Solver(premises)
+for cell in cells:
+    if solver.entails(Atom(cell)):
+        print(cell, 'has a mine')
+    elif solver.entails(Not(Atom(cell))):
+        print(cell, 'is safe')
+"""
+
+from cdcl import CDCL
+from clausedb import SymbolTable
+from cnf import TseitinEncoder
+from formula import Not
+
+
+class Solver:
+    """An incremental satisfiability checker for formulas."""
+
+    def __init__(self, premises=()):
+        self.symbols = SymbolTable()
+        self.cdcl = CDCL()
+        self.encoder = TseitinEncoder(self)
+        self.model = None
+        for premise in premises:
+            self.add(premise)
+
+    # the methods below let the solver receive clauses directly from a TseitinEncoder (as a
+    # ClauseDB does) or from the encodings of cardinality constraints
+
+    def new_var(self):
+        """Creates a new auxiliary variable and returns it."""
+        variable = self.symbols.new_var()
+        self.cdcl.ensure_variables(variable)
+        return variable
+
+    def variable(self, name):
+        """Returns the variable of the atom with the given name, creating it if necessary."""
+        variable = self.symbols.variable(name)
+        self.cdcl.ensure_variables(variable)
+        return variable
+
+    def add_clause(self, clause):
+        """Adds a clause of integer literals."""
+        self.cdcl.add_clause(clause)
+
+    def add_clause_db(self, db):
+        """Adds the clauses of a ClauseDB (see clausedb.py), identifying atoms by their names.
+
+        The auxiliary variables of db become new auxiliary variables of the solver.
+        """
+        variables = [0]
+        for variable in range(1, db.number_of_variables + 1):
+            name = db.symbols.name(variable)
+            variables.append(self.new_var() if name is None else self.variable(name))
+        for clause in db:
+            self.add_clause([variables[literal] if literal > 0 else -variables[-literal] for literal in clause])
+
+    # formulas
+
+    def add(self, formula):
+        """Adds formula to the premises."""
+        self.encoder.add(formula)
+
+    def literal(self, formula):
+        """Returns an integer literal equivalent to formula (see TseitinEncoder.literal)."""
+        return self.encoder.literal(formula)
+
+    def solve(self, assumptions=()):
+        """Checks whether the premises and the formulas in assumptions are satisfiable together.
+
+        If they are, it returns True and the attribute model is an interpretation (a dictionary
+        from atom names to truth values) satisfying them. Otherwise, it returns False.
+        """
+        literals = [self.literal(assumption) for assumption in assumptions]
+        if not self.cdcl.solve(literals):
+            self.model = None
+            return False
+        model = self.cdcl.model
+        self.model = {name: model[variable] for name, variable in self.symbols.items()}
+        return True
+
+    def entails(self, conclusion):
+        """Returns True if conclusion is a logical consequence of the premises."""
+        return not self.solve([Not(conclusion)])
+
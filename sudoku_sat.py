@@ -0,0 +1,168 @@
+"""This module solves sudoku puzzles of any size with the CDCL solver.
+
+A sudoku of box size b has n = b * b rows, columns, boxes and digits (9x9 for b = 3, 16x16 for
+b = 4, 25x25 for b = 5). Grids are lists of n lists of n integers, where 0 is an empty cell.
+
+The puzzle is encoded directly into clauses of integer literals, without building formulas.
+There is one variable for each pair (cell, digit) that is still possible after propagating the
+given digits: a digit is impossible in a cell if it is given in the same row, column or box,
+and a cell with a single possible digit is filled and propagated in turn. The clauses say that
+each empty cell has exactly one digit and that each missing digit of a row, column or box is
+in exactly one of its empty cells. For example,
+
+result = solve_sudoku(grid)
+result.solution       # the filled grid, or None if the puzzle has no solution
+result.encode_time    # seconds spent propagating the givens and writing the clauses
+result.solve_time     # seconds spent by the solver
+"""
+
+import time
+from collections import namedtuple
+from math import isqrt
+
+from cdcl import CDCL
+from clausedb import ClauseDB
+from cardinality import exactly_k
+
+
+SudokuResult = namedtuple('SudokuResult', ['solution', 'encode_time', 'solve_time', 'variables', 'clauses'])
+
+
+def units(box):
+    """Returns the rows, columns and boxes of a sudoku of box size box as lists of cells (row, column)."""
+    n = box * box
+    result = [[(i, j) for j in range(n)] for i in range(n)]
+    result += [[(i, j) for i in range(n)] for j in range(n)]
+    result += [[(r + i, c + j) for i in range(box) for j in range(box)]
+               for r in range(0, n, box) for c in range(0, n, box)]
+    return result
+
+
+class SudokuEncoding:
+    """The clauses of a sudoku puzzle, stored in a ClauseDB.
+
+    The attribute grid is the puzzle with the digits found by propagating the givens, and
+    digits maps each variable to its triple (row, column, digit). If the propagation finds a
+    cell without possible digits, the attribute ok is False and there are no clauses.
+    encoding is the encoding of the exactly-one constraints (see cardinality.py).
+    """
+
+    def __init__(self, grid, db=None, encoding='commander'):
+        n = len(grid)
+        box = isqrt(n)
+        if box * box != n or any(len(row) != n for row in grid):
+            raise ValueError("a sudoku grid must have n rows and n columns, where n is a square.")
+        self.n = n
+        self.box = box
+        self.grid = [list(row) for row in grid]
+        self.db = db if db is not None else ClauseDB()
+        self.encoding = encoding
+        self.digits = {}
+        self.variables = {}  # (row, column, digit) -> variable
+        self.ok = self._propagate()
+        if self.ok:
+            self._encode()
+
+    def units(self):
+        """Returns the rows, columns and boxes as lists of cells (row, column)."""
+        return units(self.box)
+
+    def peers(self, i, j):
+        """Returns the cells that share a row, column or box with cell (i, j)."""
+        n, box = self.n, self.box
+        r, c = i - i % box, j - j % box
+        cells = {(i, k) for k in range(n)} | {(k, j) for k in range(n)}
+        cells |= {(r + a, c + b) for a in range(box) for b in range(box)}
+        cells.discard((i, j))
+        return cells
+
+    def _propagate(self):
+        """Computes the possible digits of the empty cells, filling cells with a single one.
+        Returns False if the givens are contradictory."""
+        n, grid = self.n, self.grid
+        candidates = {}
+        queue = []
+        for i in range(n):
+            for j in range(n):
+                if grid[i][j]:
+                    if not 1 <= grid[i][j] <= n:
+                        raise ValueError(f"{grid[i][j]} is not a digit of a {n}x{n} sudoku.")
+                    queue.append((i, j))
+                else:
+                    candidates[(i, j)] = set(range(1, n + 1))
+        peers = {}
+        while queue:
+            i, j = queue.pop()
+            digit = grid[i][j]
+            if (i, j) not in peers:
+                peers[(i, j)] = self.peers(i, j)
+            for cell in peers[(i, j)]:
+                if cell in candidates:
+                    possible = candidates[cell]
+                    possible.discard(digit)
+                    if len(possible) == 1:
+                        grid[cell[0]][cell[1]] = possible.pop()
+                        del candidates[cell]
+                        queue.append(cell)
+                    elif not possible:
+                        return False
+                elif grid[cell[0]][cell[1]] == digit:
+                    return False
+        self.candidates = candidates
+        return True
+
+    def _encode(self):
+        db, variables, grid = self.db, self.variables, self.grid
+        for (i, j), possible in sorted(self.candidates.items()):
+            for digit in sorted(possible):
+                variable = variables[(i, j, digit)] = db.new_var()
+                self.digits[variable] = (i, j, digit)
+            self.exactly_one([variables[(i, j, digit)] for digit in sorted(possible)])
+        for unit in self.units():
+            placed = {grid[i][j] for i, j in unit}
+            for digit in range(1, self.n + 1):
+                if digit not in placed:
+                    self.exactly_one([variables[(i, j, digit)] for i, j in unit if (i, j, digit) in variables])
+
+    def exactly_one(self, literals):
+        """Adds clauses saying that exactly one of literals is true."""
+        exactly_k(self.db, literals, 1, self.encoding)
+
+    def solution(self, model):
+        """Returns the grid filled with the digits of a model of the clauses."""
+        solution = [list(row) for row in self.grid]
+        for variable, (i, j, digit) in self.digits.items():
+            if model[variable]:
+                solution[i][j] = digit
+        return solution
+
+
+def solve_sudoku(grid, encoding='commander'):
+    """Solves a sudoku puzzle and returns a SudokuResult with the solution (None if there is
+    none), the encoding and solving times in seconds and the size of the encoding.
+    encoding is the encoding of the exactly-one constraints (see cardinality.py)."""
+    start = time.perf_counter()
+    encoding = SudokuEncoding(grid, encoding=encoding)
+    db = encoding.db
+    encoded = time.perf_counter()
+    if not encoding.ok:
+        return SudokuResult(None, encoded - start, 0.0, 0, 0)
+    solver = CDCL()
+    solver.ensure_variables(db.number_of_variables)
+    for clause in db:
+        solver.add_clause(clause)
+    satisfiable = solver.solve()
+    solved = time.perf_counter()
+    solution = encoding.solution(solver.model) if satisfiable else None
+    return SudokuResult(solution, encoded - start, solved - encoded, db.number_of_variables, len(db))
+
+
+def is_solution(grid, solution):
+    """Checks whether solution is a filled sudoku grid agreeing with the given digits of grid."""
+    n = len(grid)
+    for i in range(n):
+        for j in range(n):
+            if grid[i][j] and grid[i][j] != solution[i][j]:
+                return False
+    digits = set(range(1, n + 1))
+    return all({solution[i][j] for i, j in unit} == digits for unit in units(isqrt(n)))
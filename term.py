@@ -1,11 +1,18 @@
-class Term:
+from hashcons import HashConsed
+
+
+class Term(HashConsed):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
     def __repr__(self):
         return str(self)
 
+
 class Con(Term):
+    __slots__ = _fields = ('name',)
 
     def __init__(self, name):
         super().__init__()
@@ -14,14 +21,9 @@ class Con(Term):
     def __str__(self):
         return str(self.name)
 
-    def __eq__(self, other):
-        return isinstance(other, Con) and other.name == self.name
-
-    def __hash__(self):
-        return hash((self.name, 'con'))
-
 
 class Var(Term):
+    __slots__ = _fields = ('name',)
 
     def __init__(self, name):
         super().__init__()
@@ -30,14 +32,9 @@ class Var(Term):
     def __str__(self):
         return str(self.name)
 
-    def __eq__(self, other):
-        return isinstance(other, Var) and other.name == self.name
-
-    def __hash__(self):
-        return hash((self.name, 'var'))
-
 
 class Fun(Term):
+    __slots__ = _fields = ('name', 'args')
 
     def __init__(self, name, args):
         super().__init__()
@@ -52,15 +49,3 @@ class Fun(Term):
             else:
                 printable_function = printable_function + str(self.args[i]) + ', '
         return printable_function
-
-    def __eq__(self, other):
-        is_equal = isinstance(other, Fun) and len(other.args) == len(self.args)
-        if not is_equal:
-            return False
-        for i in range(len(self.args)):
-            if self.args[i] != other.args[i]:
-                return False
-        return True
-
-    def __hash__(self):
-        return hash(tuple(self.args) + (self.name, 'fun'))
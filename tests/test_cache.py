@@ -0,0 +1,66 @@
+import importlib
+import os
+import shutil
+import sys
+
+import cache
+from cache import EncodingCache
+
+GENERATOR = '''from formula import And, Atom, Not
+
+
+def problem(name):
+    return And(Atom(name), Not(Atom(name + '_other')))
+'''
+
+
+def _load(directory):
+    sys.modules.pop('cached_problem', None)
+    sys.path.insert(0, str(directory))
+    try:
+        return importlib.import_module('cached_problem').problem
+    finally:
+        sys.path.remove(str(directory))
+        sys.modules.pop('cached_problem', None)
+
+
+def _load_module_from(directory):
+    (directory / 'cached_problem.py').write_text(GENERATOR)
+    return _load(directory)
+
+
+def test_key_depends_on_contents_only(tmp_path):
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    first.mkdir()
+    (first / 'cached_problem.py').write_text(GENERATOR)
+    encodings = EncodingCache(tmp_path / 'cache')
+    key = encodings.key(_load(first), 'p')
+    os.utime(first / 'cached_problem.py', (0, 0))
+    assert encodings.key(_load(first), 'p') == key
+    shutil.copytree(first, second)
+    assert encodings.key(_load(second), 'p') == key
+    assert encodings.key(_load(second), 'q') != key
+    (second / 'cached_problem.py').write_text(GENERATOR + '\n# edited\n')
+    assert encodings.key(_load(second), 'p') != key
+
+
+def test_entries_are_read_back(tmp_path):
+    encodings = EncodingCache(tmp_path)
+    problem = _load_module_from(tmp_path)
+    db = encodings.clause_db(problem, 'p')
+    again = encodings.clause_db(problem, 'p')
+    assert (encodings.hits, encodings.misses) == (1, 1)
+    assert list(again) == list(db) and again.symbols.names == db.symbols.names
+
+
+def test_entry_evicted_while_read_is_a_miss(tmp_path, monkeypatch):
+    encodings = EncodingCache(tmp_path)
+    problem = _load_module_from(tmp_path)
+    key = encodings.key(problem, 'p')
+    encodings.clause_db(problem, 'p')
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(cache.os, 'utime', evicted)
+    assert encodings.get(key) is None
+    assert (encodings.hits, encodings.misses) == (0, 2)
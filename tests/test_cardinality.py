@@ -0,0 +1,38 @@
+from itertools import product
+
+import pytest
+
+from cardinality import ENCODINGS, at_least_k, at_most_k, exactly_k
+from cdcl import CDCL
+from clausedb import ClauseDB
+
+
+CONSTRAINTS = [(at_most_k, lambda count, k: count <= k),
+               (at_least_k, lambda count, k: count >= k),
+               (exactly_k, lambda count, k: count == k)]
+
+
+@pytest.mark.parametrize('encoding', ENCODINGS)
+def test_encodings_agree_with_counting(encoding):
+    for n in range(6):
+        for k in range(-1, n + 2):
+            for constraint, holds in CONSTRAINTS:
+                db = ClauseDB()
+                literals = [db.new_var() for _ in range(n)]
+                constraint(db, literals, k, encoding)
+                for values in product((False, True), repeat=n):
+                    solver = CDCL()
+                    solver.ensure_variables(db.number_of_variables)
+                    for clause in db:
+                        solver.add_clause(list(clause))
+                    assumptions = [literal if value else -literal for literal, value in zip(literals, values)]
+                    assert solver.solve(assumptions) == holds(sum(values), k)
+
+
+@pytest.mark.parametrize('encoding', ['sequential', 'totalizer', 'network', 'commander'])
+@pytest.mark.parametrize('constraint, k', [(at_least_k, 2), (at_least_k, 997), (exactly_k, 3), (at_most_k, 996)])
+def test_encodings_are_linear(encoding, constraint, k):
+    n = 1000
+    db = ClauseDB()
+    constraint(db, [db.new_var() for _ in range(n)], k, encoding)
+    assert len(db) <= 8 * n * min(k, n - k)
@@ -0,0 +1,72 @@
+import random
+from itertools import product
+
+from cdcl import CDCL
+from formula import And, AndN, Atom, Not, OrN
+from semantics import satisfiability
+
+
+EASY_9X9 = [[5, 3, 0, 0, 7, 0, 0, 0, 0],
+            [6, 0, 0, 1, 9, 5, 0, 0, 0],
+            [0, 9, 8, 0, 0, 0, 0, 6, 0],
+            [8, 0, 0, 0, 6, 0, 0, 0, 3],
+            [4, 0, 0, 8, 0, 3, 0, 0, 1],
+            [7, 0, 0, 0, 2, 0, 0, 0, 6],
+            [0, 6, 0, 0, 0, 0, 2, 8, 0],
+            [0, 0, 0, 4, 1, 9, 0, 0, 5],
+            [0, 0, 0, 0, 8, 0, 0, 7, 9]]
+
+
+def cell(i, j, n):
+    return Atom(str(i + 1) + '_' + str(j + 1) + '_' + str(n + 1))
+
+
+def example_sudoku_formula(grid):
+    """The encoding of examples/sudoku.py for any size: the given digits, at most one digit per
+    cell and every digit at least once in each row, column and box."""
+    size = len(grid)
+    box = int(size ** 0.5)
+    formulas = []
+    for i, j in product(range(size), repeat=2):
+        if grid[i][j]:
+            formulas.append(cell(i, j, grid[i][j] - 1))
+            formulas += [Not(cell(i, j, n)) for n in range(size) if n != grid[i][j] - 1]
+        for n1 in range(size):
+            for n2 in range(n1 + 1, size):
+                formulas.append(Not(And(cell(i, j, n1), cell(i, j, n2))))
+    for n, i in product(range(size), repeat=2):
+        formulas.append(OrN([cell(i, j, n) for j in range(size)]))
+        formulas.append(OrN([cell(j, i, n) for j in range(size)]))
+    for n, r, c in product(range(size), range(0, size, box), range(0, size, box)):
+        formulas.append(OrN([cell(r + i, c + j, n) for i in range(box) for j in range(box)]))
+    return AndN(formulas)
+
+
+def test_sudoku_9x9_example_encoding():
+    model = satisfiability(example_sudoku_formula(EASY_9X9))
+    assert model
+    solution = [[next(n + 1 for n in range(9) if model[str(cell(i, j, n))]) for j in range(9)] for i in range(9)]
+    for i, j in product(range(9), repeat=2):
+        assert EASY_9X9[i][j] in (0, solution[i][j])
+    digits = set(range(1, 10))
+    for k in range(9):
+        assert set(solution[k]) == digits
+        assert {solution[i][k] for i in range(9)} == digits
+        assert {solution[k // 3 * 3 + i // 3][k % 3 * 3 + i % 3] for i in range(9)} == digits
+
+
+def test_random_3sat_agrees_with_brute_force():
+    generator = random.Random(0)
+    for _ in range(200):
+        n = generator.randint(3, 10)
+        clauses = [[generator.choice([-1, 1]) * v for v in generator.sample(range(1, n + 1), 3)]
+                   for _ in range(generator.randint(1, 5 * n))]
+        solver = CDCL()
+        for clause in clauses:
+            solver.add_clause(clause)
+        satisfiable = any(all(any((literal > 0) == values[abs(literal) - 1] for literal in clause)
+                              for clause in clauses)
+                          for values in product([False, True], repeat=n))
+        assert solver.solve() == satisfiable
+        if satisfiable:
+            assert all(any(solver.model[abs(literal)] == (literal > 0) for literal in clause) for clause in clauses)
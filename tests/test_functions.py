@@ -0,0 +1,35 @@
+import gc
+
+from formula import And, Atom, Implies, Not, Or
+from functions import analysis_cache, atoms, cache_clear, cache_info, length, subformulas
+
+
+def test_analyses():
+    formula = Implies(Atom('p'), Or(Atom('p'), Atom('s')))
+    assert subformulas(formula) == {formula, Atom('p'), Atom('s'), Or(Atom('p'), Atom('s'))}
+    assert subformulas(formula) == subformulas(formula)
+    assert atoms(formula) == {Atom('p'), Atom('s')}
+    assert atoms(Atom('p')) == {Atom('p')}
+    assert length(formula) == 5
+
+
+def test_subformulas_are_cached_while_folding():
+    cache_clear()
+    inner = And(Atom('p'), Not(Atom('q')))
+    assert length(Or(inner, Atom('r'))) == 6
+    assert length(inner) == 4
+    assert cache_info().hits == 1
+
+
+def test_entries_die_with_their_formulas():
+    cache_clear()
+    formula = And(Atom('collected_p'), Atom('collected_q'))
+    subformulas(formula)
+    atoms(formula)
+    atoms(Atom('collected_p'))
+    length(formula)
+    assert cache_info().currsize > 0
+    del formula
+    gc.collect()
+    assert cache_info().currsize == 0
+    assert not analysis_cache.table
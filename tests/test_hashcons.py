@@ -0,0 +1,18 @@
+from formula import And, AndN, Atom, OrN
+from fol_formula import Atom as FOLAtom
+from term import Var
+
+
+def test_equal_nodes_are_identical():
+    assert And(Atom('p'), Atom('q')) is And(Atom('p'), Atom('q'))
+    assert FOLAtom('P', [Var('x')]) is FOLAtom('P', (Var('x'),))
+    assert Atom(1) is not Atom(True)
+
+
+def test_iterable_arguments_are_frozen():
+    a, b = Atom('p'), Atom('q')
+    assert AndN([a, b]) is AndN((a, b))
+    assert OrN(atom for atom in (a, b)) is OrN((a, b))
+    assert AndN({'x': a, 'y': b}.values()) is AndN((a, b))
+    assert AndN({a}) is AndN((a,))
+    assert type(AndN({a, b}).args) is tuple
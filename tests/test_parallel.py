@@ -0,0 +1,24 @@
+from bitparallel import atom_masks
+from formula import And, Atom, Implies, Not, Or, OrN
+from parallel import parallel_is_valid, parallel_model, shutdown
+
+
+def test_atom_masks():
+    assert atom_masks(2) == [0b0011, 0b0101]
+    for n in range(1, 12):
+        for i, mask in enumerate(atom_masks(n)):
+            assert mask.bit_count() == 1 << (n - 1)
+            assert all((mask >> row & 1) == (not row >> (n - 1 - i) & 1) for row in range(1 << n))
+
+
+def test_searches_reuse_the_processes():
+    try:
+        atoms = [Atom(f'p{i}') for i in range(12)]
+        assert parallel_is_valid(OrN(atoms + [Not(atoms[0])]), processes=2)
+        assert not parallel_is_valid(OrN(atoms), processes=2)
+        model = parallel_model(And(atoms[0], Implies(atoms[0], Not(atoms[1]))), processes=2)
+        assert model == {'p0': True, 'p1': False}
+        assert parallel_model(And(atoms[0], Not(atoms[0])), processes=2) is False
+        assert parallel_is_valid(Or(atoms[2], Not(atoms[2])), processes=2)
+    finally:
+        shutdown()
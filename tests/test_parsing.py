@@ -0,0 +1,21 @@
+from formula import And, AndN, Atom, Implies, Not, Or, OrN
+from parsing import parse
+from semantics import truth_value
+
+
+def test_binary_connectives():
+    assert parse('(p & ~q) -> r') is Implies(And(Atom('p'), Not(Atom('q'))), Atom('r'))
+    assert parse('(a & b) & c') is And(And(Atom('a'), Atom('b')), Atom('c'))
+
+
+def test_chains_become_n_ary():
+    a, b, c, d = Atom('a'), Atom('b'), Atom('c'), Atom('d')
+    assert parse('a & b & c | d') is Or(AndN((a, b, c)), d)
+    assert parse('a | b & c | d') is OrN((a, And(b, c), d))
+
+
+def test_long_chain_is_evaluated():
+    names = [f'p{i}' for i in range(5000)]
+    formula = parse(' ∧ '.join(names))
+    assert len(formula.args) == 5000
+    assert truth_value(formula, dict.fromkeys(names, True))
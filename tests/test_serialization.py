@@ -0,0 +1,29 @@
+from dimacs import read_dimacs
+from fol_formula import Atom as FOLAtom, ForAll
+from formula import And, AndN, Atom, Not, Or, OrN
+from semantics import is_valid
+from serialization import dumps, loads
+from term import Fun, Var
+
+
+def test_round_trip():
+    formula = And(Atom('p'), Not(Or(Atom('p'), Atom('reuniao na segunda'))))
+    assert loads(dumps(formula)) is formula
+    sentence = ForAll(Var('x'), FOLAtom('P', [Var('x'), Fun('f', [Var('x')])]))
+    assert loads(dumps(sentence)) is sentence
+
+
+def test_round_trip_with_int_atoms():
+    formula = AndN((Atom(1), Not(Atom(-2)), Atom('1'), Atom(10 ** 30)))
+    loaded = loads(dumps(formula))
+    assert loaded is formula
+    assert [type(arg.name if isinstance(arg, Atom) else arg.inner.name) for arg in loaded.args] == [int, int, str, int]
+
+
+def test_round_trip_of_dimacs_clauses(tmp_path):
+    path = tmp_path / 'problem.cnf'
+    path.write_text('p cnf 3 2\n1 -2 0\n2 3 0\n')
+    formula = AndN(OrN(Atom(literal) if literal > 0 else Not(Atom(-literal)) for literal in clause)
+                   for clause in read_dimacs(path))
+    assert loads(dumps(formula)) is formula
+    assert not is_valid(formula, processes=2)
@@ -0,0 +1,147 @@
+"""This module evaluates formulas of first-order logic for all values of their free variables at once.
+
+Interpretation.truth_value (see interpretation_fol.py) evaluates ∀x∀y∃z φ by calling itself
+|D|^3 times. Here, a formula with free variables x1, ..., xk is evaluated into a boolean NumPy
+array with one axis of length |D| per free variable (a tensor): the entry at (c1, ..., ck) is the
+truth value of the formula when each xi denotes the element with code ci (see
+indexed_interpretation.py). Terms are evaluated into arrays of codes in the same way.
+Connectives become NumPy logical operations on arrays broadcast over the union of their free
+variables, and quantifiers become all/any reductions along the axis of their variable. For
+example,
+
+interpretation = IndexedInterpretation(...)
+vectorized_truth_value(interpretation, formula)
+interpretation.truth_value(formula, vectorized=True)   # the same
+
+The arrays of a subformula with k free variables have |D|^k entries, so this is meant for
+formulas with few variables free at the same time (the nesting of quantifiers does not matter).
+This module requires NumPy.
+"""
+
+from fol_formula import And, Atom, Exists, ForAll, Implies, Not, Or
+from term import Con, Fun, Var
+from indexed_interpretation import IndexedInterpretation, KEY_MAX, UNDEFINED, numpy_module, variable_name
+
+np = numpy_module()
+if np is None:
+    raise ImportError("vectorized_fol requires NumPy.")
+
+
+class Tensor:
+    """An array with one axis for each variable in variables (a sorted tuple of names)."""
+
+    __slots__ = ('variables', 'values')
+
+    def __init__(self, variables, values):
+        self.variables = variables
+        self.values = values
+
+    def expand(self, variables):
+        """Returns the values reshaped for broadcasting over variables (a sorted superset of self.variables)."""
+        shape = [1] * len(variables)
+        for axis, name in enumerate(self.variables):
+            shape[variables.index(name)] = self.values.shape[axis]
+        return self.values.reshape(shape)
+
+
+def _union(*tensors):
+    return tuple(sorted(set().union(*(tensor.variables for tensor in tensors))))
+
+
+class VectorizedEvaluator:
+    """Evaluates terms and formulas over an IndexedInterpretation into Tensors."""
+
+    def __init__(self, interpretation):
+        if not isinstance(interpretation, IndexedInterpretation):
+            interpretation = IndexedInterpretation.from_interpretation(interpretation)
+        self.interpretation = interpretation
+        self.size = interpretation.size
+        self._memberships = {}
+
+    def membership(self, name):
+        """Returns a boolean array indexed by key telling whether a tuple is in the relation name,
+        or None if the relation has no bitset."""
+        if name not in self._memberships:
+            relation = self.interpretation.relations[name]
+            if relation.bits is None:
+                self._memberships[name] = None
+            else:
+                bits = np.unpackbits(np.frombuffer(bytes(relation.bits), dtype=np.uint8), bitorder='little')
+                self._memberships[name] = bits[:relation.size ** relation.arity].astype(bool)
+        return self._memberships[name]
+
+    def _keys(self, args):
+        """Returns the Tensor of the keys (see indexed_interpretation.Relation.key) of a list of terms."""
+        if self.size ** len(args) > KEY_MAX:
+            raise ValueError("the keys of the arguments do not fit in 64-bit integers.")
+        tensors = [self.term(arg) for arg in args]
+        variables = _union(*tensors)
+        key = np.zeros((1,) * len(variables), dtype=np.int64)
+        for tensor in tensors:
+            key = key * self.size + tensor.expand(variables)
+        return Tensor(variables, key)
+
+    def term(self, term):
+        """Returns the Tensor of the codes of the interpretation of term."""
+        if isinstance(term, Var):
+            return Tensor((term.name,), np.arange(self.size, dtype=np.int64))
+        elif isinstance(term, Con):
+            return Tensor((), np.array(self.interpretation.constant_codes[term.name], dtype=np.int64))
+        elif isinstance(term, Fun):
+            function = self.interpretation.function_tables[term.name]
+            if not function.dense:
+                raise ValueError(f"the function {term.name} is too large to be evaluated with arrays.")
+            keys = self._keys(term.args)
+            codes = np.asarray(function.values)[keys.values].astype(np.int64)
+            if (codes == UNDEFINED).any():
+                raise KeyError(f"{term.name} is not defined for all arguments.")
+            return Tensor(keys.variables, codes)
+        raise TypeError(f"{term!r} is not a term.")
+
+    def formula(self, formula):
+        """Returns the Tensor of the truth values of formula."""
+        if isinstance(formula, Atom):
+            keys = self._keys(formula.args)
+            if not len(self.interpretation.relations[formula.name]):
+                return Tensor(keys.variables, np.zeros(keys.values.shape, dtype=bool))
+            membership = self.membership(formula.name)
+            if membership is not None:
+                return Tensor(keys.variables, membership[keys.values])
+            relation_keys = np.asarray(self.interpretation.relations[formula.name].keys)
+            return Tensor(keys.variables, np.isin(keys.values, relation_keys))
+        elif isinstance(formula, Not):
+            inner = self.formula(formula.inner)
+            return Tensor(inner.variables, ~inner.values)
+        elif isinstance(formula, (And, Or, Implies)):
+            left, right = self.formula(formula.left), self.formula(formula.right)
+            variables = _union(left, right)
+            a, b = left.expand(variables), right.expand(variables)
+            if isinstance(formula, And):
+                values = a & b
+            elif isinstance(formula, Or):
+                values = a | b
+            else:
+                values = ~a | b
+            return Tensor(variables, values)
+        elif isinstance(formula, (ForAll, Exists)):
+            inner = self.formula(formula.inner)
+            name = variable_name(formula.var)
+            if name not in inner.variables:
+                if self.size == 0:
+                    return Tensor((), np.array(isinstance(formula, ForAll)))
+                return inner
+            axis = inner.variables.index(name)
+            reduce = np.all if isinstance(formula, ForAll) else np.any
+            variables = inner.variables[:axis] + inner.variables[axis + 1:]
+            return Tensor(variables, reduce(inner.values, axis=axis))
+        raise TypeError(f"{formula!r} is not a formula of first-order logic.")
+
+
+def vectorized_truth_value(interpretation, formula):
+    """Returns the truth value of formula in an interpretation (an Interpretation or an
+    IndexedInterpretation), where free variables denote their values in interpretation.variables."""
+    evaluator = VectorizedEvaluator(interpretation)
+    interpretation = evaluator.interpretation
+    tensor = evaluator.formula(formula)
+    index = tuple(interpretation.codes[interpretation.variables[name]] for name in tensor.variables)
+    return bool(tensor.values[index])